@@ -4,29 +4,25 @@ Add audioUrl fields to all dialogue lines in section JSON files.
 Audio files follow naming convention: d{section}_{dialogue}_line{n}.mp3
 """
 
-import json
 import os
 from pathlib import Path
 
+from content_repository import ContentRepository, section_code, write_if_changed
+
 CONTENT_DIR = Path(__file__).parent.parent / "content" / "sections"
 AUDIO_BASE_PATH = "assets/audio/sections"
 
-def add_audio_urls_to_section(json_path: Path):
-    """Add audioUrl fields to dialogues in a section JSON file."""
+def add_audio_urls_to_section(json_path: Path, data: dict):
+    """Add audioUrl fields to dialogues of a loaded section and save it if anything changed."""
     
-    # Extract section number from filename
     filename = json_path.stem  # e.g., "section_01_greetings" or "section_19"
-    parts = filename.split('_')
-    section_num = parts[1]  # e.g., "01" or "19"
+    section_num = section_code(filename)  # e.g., "01" or "19"
     
     # Handle section_01a case
     if 'a' in section_num:
         print(f"  Skipping {filename} (already processed)")
         return False
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     dialogues = data.get('dialogues', [])
     if not dialogues:
         print(f"  No dialogues in {filename}")
@@ -44,9 +40,7 @@ def add_audio_urls_to_section(json_path: Path):
                 line['audioUrl'] = audio_path
                 modified = True
     
-    if modified:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+    if modified and write_if_changed(json_path, data):
         print(f"  ✓ Updated {filename} ({len(dialogues)} dialogues)")
     else:
         print(f"  - {filename} (no changes needed)")
@@ -57,11 +51,11 @@ def main():
     print("Adding audio URLs to dialogue lines in all sections...")
     print("=" * 60)
     
-    json_files = sorted(CONTENT_DIR.glob("section_*.json"))
+    repository = ContentRepository(sections_dir=CONTENT_DIR)
     updated_count = 0
     
-    for json_path in json_files:
-        if add_audio_urls_to_section(json_path):
+    for _, json_path, data in repository.sections():
+        if add_audio_urls_to_section(json_path, data):
             updated_count += 1
     
     print("=" * 60)
@@ -4,23 +4,305 @@ Medical German AI Content Populator
 Uses Google Gemini to generate actual medical German content for all sections.
 Requires: pip install google-generativeai
 Set GEMINI_API_KEY environment variable before running.
+
+Components are generated concurrently, cached, retried and staged on disk,
+so a rerun only pays for what is still missing. --provider replay and
+--provider synthetic run the pipeline without network access.
+
+Usage:
+    python ai_populate.py --section 19
+    python ai_populate.py --all --metadata --pack 5
+    python ai_populate.py --all --provider synthetic --latency 0.5
+    python ai_populate.py --stats
 """
 
+import hashlib
 import json
+import math
 import os
+import random
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-try:
-    import google.generativeai as genai
-    HAS_GENAI = True
-except ImportError:
-    HAS_GENAI = False
+from content_repository import ContentRepository, section_id as file_section_id, write_if_changed
 
 CONTENT_DIR = Path(__file__).parent.parent / "content" / "sections"
+CACHE_DIR = Path(__file__).parent / ".ai_cache"
+METRICS_PATH = Path(__file__).parent / ".ai_metrics.jsonl"
+STAGING_DIR = Path(__file__).parent / ".ai_staging"
+
+MODEL_NAME = 'gemini-2.0-flash'
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+DEFAULT_CACHE_SIZE_MB = 200
+
+DEFAULT_PROVIDER = 'gemini'
+DEFAULT_SIMULATED_LATENCY = 1.0
+STREAM_CHUNK_CHARS = 80
+LANGUAGES = ['en', 'bn', 'hi', 'ur', 'tr']
+
+# Follow-up calls allowed for the missing remainder of a truncated list
+MAX_CONTINUATION_CALLS = 2
+
+DEFAULT_MAX_MODEL_CALLS = 4
+DEFAULT_SECTIONS_IN_FLIGHT = 3
+
+# Items generated per section component
+COMPONENT_COUNTS = {"vocabulary": 30, "dialogues": 5, "exercises": 18}
+COMPONENT_ATTEMPTS = 3
+COMPONENT_RETRY_DELAY = 2.0
+
+# Sections per packed metadata request (1 disables packing)
+DEFAULT_METADATA_PACK = 5
+METADATA_TEXT_KEYS = ["introduction", "grammarFocus", "culturalNotes", "summary"]
+
+# Vocabulary is requested in chunks of this size, in parallel
+VOCAB_CHUNK_SIZE = 10
+GERMAN_ARTICLES = ('der', 'die', 'das')
+
+# Global cap on concurrent model calls, shared by every section and generator
+model_slots = threading.BoundedSemaphore(DEFAULT_MAX_MODEL_CALLS)
+
+# Runs the independent generators of a section; kept separate from the
+# section pool so sections waiting on their generators cannot starve it
+generator_executor = ThreadPoolExecutor(max_workers=3 * DEFAULT_SECTIONS_IN_FLIGHT)
+
+# Vocabulary chunks get their own pool so they never wait on the generator pool they run from
+vocab_chunk_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_MODEL_CALLS)
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of model responses with size-based LRU eviction.
+
+    Each entry is one JSON file named by the hash of model name, generation
+    settings and prompt. Hits refresh the file's mtime; when the directory
+    grows past max_bytes the least recently used entries are removed.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = DEFAULT_CACHE_SIZE_MB * 1024 * 1024,
+                 refresh: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, settings: dict, prompt: str) -> str:
+        raw = json.dumps({"model": model_name, "settings": settings, "prompt": prompt},
+                         ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss (always a miss with refresh)."""
+        path = self._path(key)
+        if self.refresh or not path.exists():
+            with self.lock:
+                self.misses += 1
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = json.load(f)["text"]
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, model_name: str, prompt: str, text: str):
+        """Store a response, then evict least recently used entries over the size limit."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"model": model_name, "prompt": prompt, "text": text}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# Shared response cache, opened in main() unless --no-cache is given
+response_cache = None
+
+
+class MetricsLog:
+    """Append-only JSON-lines log with one record per model call (or cache hit)."""
+
+    def __init__(self, path: Path = METRICS_PATH):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def record(self, **fields):
+        fields["time"] = round(time.time(), 3)
+        line = json.dumps(fields, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+# Per-call telemetry, opened in main()
+metrics = None
+
+
+def log_call(kind: str, section_id: Optional[str], prompt: str, response: str, started: float, timing: dict,
+             retries: int = 0, fallback: bool = False, cached: bool = False, items: Optional[int] = None,
+             error: Optional[str] = None, continuation: int = 0):
+    """Write one model call to the metrics log, if one is open.
+
+    retries is the number of failed attempts of the component before this
+    one (with_retries); continuation numbers the follow-up calls that
+    complete a truncated response.
+    """
+    if metrics is None:
+        return
+    finished = time.perf_counter()
+    acquired = timing.get("acquired", started)
+    metrics.record(
+        kind=kind,
+        section=section_id,
+        prompt_chars=len(prompt),
+        response_chars=len(response),
+        wait=round(acquired - started, 4),
+        latency=round(finished - acquired, 4),
+        retries=retries,
+        continuation=continuation,
+        fallback=fallback,
+        cached=cached,
+        items=items,
+        error=error,
+    )
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_stats(path: Path = METRICS_PATH):
+    """Summarize the metrics log per generator kind."""
+    if not Path(path).exists():
+        print(f"No metrics recorded yet ({path})")
+        return
+    records = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn line from a crash
+            records.setdefault(record.get("kind") or "unknown", []).append(record)
+    
+    print(f"AI generation metrics ({path})")
+    print("=" * 105)
+    print(f"{'kind':<15}{'calls':>7}{'cached':>8}{'errors':>8}{'p50 s':>8}{'p95 s':>8}{'wait s':>8}"
+          f"{'prompt':>9}{'response':>10}{'fallback':>10}{'retries':>9}{'contin.':>8}")
+    for kind, kind_records in sorted(records.items()):
+        calls = [r for r in kind_records if not r.get("cached")]
+        cached = len(kind_records) - len(calls)
+        errors = sum(1 for r in calls if r.get("error"))
+        latencies = [r["latency"] for r in calls] or [0.0]
+        waits = [r.get("wait", 0.0) for r in calls] or [0.0]
+        prompt_chars = sum(r["prompt_chars"] for r in kind_records) / len(kind_records)
+        response_chars = sum(r["response_chars"] for r in kind_records) / len(kind_records)
+        fallback_rate = sum(1 for r in kind_records if r.get("fallback")) / len(kind_records)
+        retries = sum(1 for r in kind_records if r.get("retries"))
+        continuations = sum(1 for r in kind_records if r.get("continuation"))
+        print(f"{kind:<15}{len(calls):>7}{cached:>8}{errors:>8}{percentile(latencies, 0.5):>8.2f}"
+              f"{percentile(latencies, 0.95):>8.2f}{sum(waits) / len(waits):>8.2f}{prompt_chars:>9.0f}"
+              f"{response_chars:>10.0f}{fallback_rate:>10.1%}{retries:>9}{continuations:>8}")
+
+
+def term_key(item: dict) -> tuple:
+    """Normalized (article, term) pair used to detect duplicate vocabulary."""
+    term = ' '.join(str(item.get('germanTerm') or '').lower().split())
+    article = str(item.get('article') or '').strip().lower()
+    first, _, rest = term.partition(' ')
+    if first in GERMAN_ARTICLES and rest:
+        # "die Röntgenaufnahme" and "Röntgenaufnahme" + article "die" are the same term
+        article, term = article or first, rest
+    if article not in GERMAN_ARTICLES:
+        article = ''
+    return article, term
+
+
+class TermIndex:
+    """Index of every vocabulary term in content/sections, by the sections using it.
+
+    Sections generated in the same run claim their new terms here, so
+    parallel sections do not produce the same entry either.
+    """
+
+    def __init__(self, repository: ContentRepository):
+        self.sections = {}
+        self.lock = threading.Lock()
+        for file_id, path in repository.section_paths().items():
+            try:
+                data = repository.section(file_id)
+            except (OSError, json.JSONDecodeError):
+                continue
+            section_id = data.get("id", path.stem)
+            for item in data.get("vocabulary", []):
+                key = term_key(item)
+                if key[1]:
+                    self.sections.setdefault(key, set()).add(section_id)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def claim(self, item: dict, section_id: str) -> bool:
+        """Register a term for a section; False if another section already has it."""
+        key = term_key(item)
+        with self.lock:
+            owners = self.sections.setdefault(key, set())
+            if owners - {section_id}:
+                return False
+            owners.add(section_id)
+            return True
+
+
+# Corpus-wide vocabulary index, built in main()
+term_index = None
+
+# Sections on disk, listed in main() and parsed on first use
+repository = None
 
 
 def fix_json_string(text: str) -> str:
@@ -90,29 +372,512 @@ SECTION_TOPICS = {
 }
 
 
-def get_ai_model():
-    """Initialize and return Gemini model."""
-    if not HAS_GENAI:
-        raise ImportError("google-generativeai package not installed. Run: pip install google-generativeai")
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class ModelProvider:
+    """Interface for the service that answers generation prompts."""
+
+    name = 'base'
+    model_name = 'base'
+
+    def generate(self, prompt: str) -> str:
+        """Return the full response text for a prompt."""
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response text for a prompt in chunks."""
+        yield self.generate(prompt)
+
+    def close(self):
+        pass
+
+
+class GeminiProvider(ModelProvider):
+    """Live Gemini model via google-generativeai."""
+
+    name = 'gemini'
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        # Imported here so the other providers, --stats and --help never load it
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise ImportError("google-generativeai not installed. Run: pip install google-generativeai") from None
+        
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable not set")
+        
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name, safety_settings=SAFETY_SETTINGS)
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. finish or safety metadata)
+                continue
+            if text:
+                yield text
+
+
+class SimulatedProvider(ModelProvider):
+    """Base for offline providers: waits a simulated latency, then streams the text in chunks."""
+
+    def __init__(self, latency: float = DEFAULT_SIMULATED_LATENCY, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.delays = random.Random(seed)
+
+    def respond(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def _wait(self):
+        with self.lock:
+            delay = max(0.0, self.delays.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+        time.sleep(delay)
+
+    def generate(self, prompt: str) -> str:
+        self._wait()
+        return self.respond(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        text = self.generate(prompt)
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            yield text[start:start + STREAM_CHUNK_CHARS]
+
+
+class ReplayProvider(SimulatedProvider):
+    """Serves responses recorded in a cassette file by RecordingProvider.
+
+    A cassette is a JSON object {"model": ..., "interactions": {sha256(prompt):
+    {"prompt": ..., "response": ...}}}. Prompts that were never recorded fail.
+    """
+
+    name = 'replay'
+
+    def __init__(self, cassette: Path, latency: float = DEFAULT_SIMULATED_LATENCY, jitter: float = 0.0, seed: int = 0):
+        super().__init__(latency, jitter, seed)
+        with open(cassette, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.model_name = data.get("model", self.name)
+        self.interactions = data.get("interactions", {})
+
+    def respond(self, prompt: str) -> str:
+        interaction = self.interactions.get(prompt_key(prompt))
+        if interaction is None:
+            raise LookupError(f"Prompt not in cassette: {prompt[:60]!r}...")
+        return interaction["response"]
+
+
+class SyntheticProvider(SimulatedProvider):
+    """Generates schema-valid vocabulary, dialogue, exercise and metadata payloads.
+
+    The payload is derived from the prompt and seed only, so runs are
+    reproducible, and terms are unique per prompt so deduplication keeps them.
+    """
+
+    name = 'synthetic'
+    model_name = 'synthetic'
+
+    COUNT_PATTERNS = [r'ONLY the (\d+) remaining', r'exactly (\d+)', r'create (\d+)', r'Create (\d+)']
+
+    def _count(self, prompt: str, default: int = 1) -> int:
+        for pattern in self.COUNT_PATTERNS:
+            match = re.search(pattern, prompt)
+            if match:
+                return int(match.group(1))
+        return default
+
+    @staticmethod
+    def _multilingual(text: str) -> dict:
+        return {lang: f"[{lang}] {text}" for lang in LANGUAGES}
+
+    def _vocabulary(self, rng, tag: str, i: int) -> dict:
+        article = rng.choice(['der', 'die', 'das'])
+        term = f"Begriff{tag}{i}"
+        return {
+            "germanTerm": term,
+            "article": article,
+            "plural": f"{term}e",
+            "pronunciation": f"/bəˈɡʁɪf{i}/",
+            "category": "noun",
+            "translation": self._multilingual(f"term {tag}{i}"),
+            "exampleSentence": f"Der Arzt erklärt {article} {term}.",
+            "exampleTranslation": self._multilingual(f"The doctor explains term {tag}{i}."),
+        }
+
+    def _dialogue(self, rng, tag: str, i: int) -> dict:
+        speakers = [("Dr. Schmidt", "Oberarzt"), ("Schwester Weber", "Krankenschwester"), ("Patient Müller", "Patient")]
+        lines = []
+        for n in range(rng.randint(5, 6)):
+            speaker, role = speakers[n % len(speakers)]
+            lines.append({
+                "speaker": speaker,
+                "speakerRole": role,
+                "germanText": f"Satz {n + 1} im Gespräch {tag}{i}.",
+                "translation": self._multilingual(f"Line {n + 1} of dialogue {tag}{i}."),
+            })
+        return {
+            "title": self._multilingual(f"Dialogue {tag}{i}"),
+            "context": self._multilingual(f"Ward scenario {tag}{i}."),
+            "lines": lines,
+        }
+
+    def _exercise(self, rng, tag: str, i: int) -> dict:
+        exercise_type = ['multipleChoice', 'fillBlank', 'translation'][i % 3]
+        question = self._multilingual(f"Question {tag}{i}")
+        question["de"] = f"Frage {tag}{i}"
+        exercise = {
+            "type": exercise_type,
+            "question": question,
+            "correctAnswer": f"Antwort {tag}{i}",
+            "explanation": self._multilingual(f"Explanation {tag}{i}."),
+            "points": 10,
+        }
+        if exercise_type == 'multipleChoice':
+            options = [f"Antwort {tag}{i}"] + [f"Option {tag}{i}-{n}" for n in range(1, 4)]
+            rng.shuffle(options)
+            exercise["options"] = options
+        return exercise
+
+    def _metadata(self, tag: str) -> dict:
+        return {
+            "title": self._multilingual(f"Section {tag}"),
+            "description": self._multilingual(f"Description of section {tag}."),
+            "textContent": {
+                "introduction": self._multilingual(f"Introduction to section {tag}."),
+                "grammarFocus": self._multilingual("- Point 1\n- Point 2"),
+                "culturalNotes": self._multilingual(f"Cultural note {tag}."),
+                "summary": self._multilingual(f"Summary of section {tag}."),
+            },
+            "learningObjectives": [f"Objective {n} of section {tag}" for n in range(1, 5)],
+        }
+
+    def respond(self, prompt: str) -> str:
+        digest = prompt_key(prompt)
+        rng = random.Random(f"{self.seed}:{digest}")
+        tag = digest[:6]
+        if "metadata for each of these section topics" in prompt:
+            packed = {num: self._metadata(f"{tag}-{num}") for num in re.findall(r'^"(\d+)":', prompt, re.MULTILINE)}
+            return json.dumps(packed, ensure_ascii=False)
+        if "multilingual metadata" in prompt:
+            return json.dumps(self._metadata(tag), ensure_ascii=False)
+        if "dialogues" in prompt:
+            make_item = self._dialogue
+        elif "exercises" in prompt:
+            make_item = self._exercise
+        else:
+            make_item = self._vocabulary
+        items = [make_item(rng, tag, i) for i in range(1, self._count(prompt) + 1)]
+        return json.dumps(items, ensure_ascii=False)
+
+
+class RecordingProvider(ModelProvider):
+    """Wraps another provider and records every answered prompt into a cassette file."""
+
+    name = 'record'
+
+    def __init__(self, provider: ModelProvider, cassette: Path):
+        self.provider = provider
+        self.model_name = provider.model_name
+        self.cassette = Path(cassette)
+        self.interactions = {}
+        self.lock = threading.Lock()
+        if self.cassette.exists():
+            with open(self.cassette, 'r', encoding='utf-8') as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def _record(self, prompt: str, response: str):
+        with self.lock:
+            self.interactions[prompt_key(prompt)] = {"prompt": prompt, "response": response}
+
+    def generate(self, prompt: str) -> str:
+        text = self.provider.generate(prompt)
+        self._record(prompt, text)
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        parts = []
+        for chunk in self.provider.stream(prompt):
+            parts.append(chunk)
+            yield chunk
+        self._record(prompt, ''.join(parts))
+
+    def close(self):
+        self.provider.close()
+        with self.lock:
+            with open(self.cassette, 'w', encoding='utf-8') as f:
+                json.dump({"model": self.model_name, "interactions": self.interactions}, f, ensure_ascii=False, indent=4)
+        print(f"Recorded {len(self.interactions)} interactions to {self.cassette}")
+
+
+PROVIDERS = {
+    GeminiProvider.name: GeminiProvider,
+    ReplayProvider.name: ReplayProvider,
+    SyntheticProvider.name: SyntheticProvider,
+}
+
+
+def create_provider(name: str, cassette: Optional[Path] = None, latency: float = DEFAULT_SIMULATED_LATENCY,
+                    jitter: float = 0.0, seed: int = 0) -> ModelProvider:
+    """Build the model provider selected on the command line."""
+    if name == ReplayProvider.name:
+        if cassette is None:
+            raise ValueError("--provider replay needs --cassette")
+        return ReplayProvider(cassette, latency, jitter, seed)
+    if name == SyntheticProvider.name:
+        return SyntheticProvider(latency, jitter, seed)
+    return PROVIDERS[name]()
+
+
+def call_model(model: ModelProvider, prompt: str, timing: Optional[dict] = None) -> str:
+    """Send a prompt to the model within the global concurrency cap and return the response text.
+
+    If given, timing["acquired"] is set when the call gets its slot.
+    """
+    with model_slots:
+        if timing is not None:
+            timing["acquired"] = time.perf_counter()
+        return model.generate(prompt)
+
+
+def call_model_stream(model: ModelProvider, prompt: str, timing: Optional[dict] = None) -> Iterator[str]:
+    """Stream the response text of a prompt chunk by chunk within the global concurrency cap."""
+    with model_slots:
+        if timing is not None:
+            timing["acquired"] = time.perf_counter()
+        yield from model.stream(prompt)
+
+
+class JsonArrayStream:
+    """Incremental parser that yields each complete element of a streamed JSON array.
+
+    Text before the opening '[' (such as a markdown fence) is skipped, and an
+    element that fails to parse is dropped instead of failing the whole array.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.started = False
+        self.closed = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.item_start = None
+        self.skipped_prefix = False
+        self.dropped = 0
+
+    @property
+    def needed_fallback(self) -> bool:
+        """True unless the response was one clean, complete JSON array."""
+        return self.skipped_prefix or self.dropped > 0 or not self.closed
+
+    def _finish_item(self, end: int, items: list):
+        text = self.buffer[self.item_start:end].strip()
+        self.item_start = None
+        if not text:
+            return
+        try:
+            items.append(json.loads(fix_json_string(text)))
+        except json.JSONDecodeError:
+            self.dropped += 1
+
+    def feed(self, chunk: str) -> list:
+        """Consume a chunk of text and return the elements completed by it."""
+        items = []
+        self.buffer += chunk
+        buffer = self.buffer
+        i = self.pos
+        if not self.started:
+            start = buffer.find('[', i)
+            if start < 0:
+                self.pos = len(buffer)
+                return items
+            self.started = True
+            self.skipped_prefix = bool(buffer[:start].strip())
+            i = start + 1
+
+        while i < len(buffer) and not self.closed:
+            c = buffer[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif c == '\\':
+                    self.escaped = True
+                elif c == '"':
+                    self.in_string = False
+            elif c == '"':
+                self.in_string = True
+                if self.depth == 0 and self.item_start is None:
+                    self.item_start = i
+            elif c in '{[':
+                if self.depth == 0 and self.item_start is None:
+                    self.item_start = i
+                self.depth += 1
+            elif c in '}]':
+                if self.depth == 0:
+                    # Closing bracket of the array itself
+                    if self.item_start is not None:
+                        self._finish_item(i, items)
+                    self.closed = True
+                else:
+                    self.depth -= 1
+                    if self.depth == 0 and self.item_start is not None and buffer[self.item_start] in '{[':
+                        self._finish_item(i + 1, items)
+            elif self.depth == 0:
+                if c == ',':
+                    if self.item_start is not None:
+                        self._finish_item(i, items)
+                elif not c.isspace() and self.item_start is None:
+                    self.item_start = i
+            i += 1
+
+        self.pos = i
+        return items
+
+
+def _cache_key(model, prompt: str):
+    model_name = getattr(model, 'model_name', MODEL_NAME)
+    return model_name, ResponseCache.make_key(model_name, {"safety_settings": SAFETY_SETTINGS}, prompt)
+
+
+def stream_json_items(model, prompt: str, kind: str = '', section_id: Optional[str] = None,
+                      continuation: int = 0, retry: int = 0) -> list:
+    """Collect the complete array elements of one (possibly truncated) streamed response."""
+    started = time.perf_counter()
+    timing = {}
+    model_name, key = _cache_key(model, prompt)
+    cached = response_cache.get(key) if response_cache is not None else None
+    chunks = [cached] if cached is not None else call_model_stream(model, prompt, timing)
     
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
+    parser = JsonArrayStream()
+    items = []
+    raw = []
+    error = None
+    try:
+        for chunk in chunks:
+            raw.append(chunk)
+            items.extend(parser.feed(chunk))
+    except Exception as e:
+        error = str(e)
+        # A dropped stream still leaves the items parsed so far
+        if not items:
+            log_call(kind, section_id, prompt, ''.join(raw), started, timing, retry, True, False, 0, error,
+                     continuation)
+            raise
+        print(f"    ⚠ Stream interrupted after {len(items)} items: {e}")
     
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel(
-        'gemini-2.0-flash',
-        safety_settings=[
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-        ]
-    )
+    log_call(kind, section_id, prompt, ''.join(raw), started, timing, retry, parser.needed_fallback,
+             cached is not None, len(items), error, continuation)
+    # Interrupted or unterminated streams are not cached, so a rerun requests the full answer again
+    if cached is None and items and error is None and parser.closed and response_cache is not None:
+        response_cache.put(key, model_name, prompt, ''.join(raw))
+    return items
+
+
+def item_label(item) -> str:
+    """Short human-readable label of a generated item for continuation prompts."""
+    if isinstance(item, dict):
+        for key in ('germanTerm', 'title', 'question'):
+            value = item.get(key)
+            if isinstance(value, dict):
+                value = value.get('de') or value.get('en')
+            if isinstance(value, str) and value:
+                return value
+    return json.dumps(item, ensure_ascii=False)[:80]
+
 
+def continuation_prompt(prompt: str, items: list, missing: int) -> str:
+    """Ask for only the items a truncated response did not deliver."""
+    done = json.dumps([item_label(item) for item in items], ensure_ascii=False)
+    return f"""{prompt}
 
-def generate_vocabulary(model, topic: str, count: int = 30) -> list:
-    """Generate vocabulary items using AI."""
+The previous response was cut off. These items are already done: {done}
+Generate ONLY the {missing} remaining items, different from the ones above, as a valid JSON array. No markdown."""
+
+
+def generate_items(model, prompt: str, count: int, kind: str = '', section_id: Optional[str] = None,
+                   retry: int = 0) -> list:
+    """Generate a JSON array of count items, keeping complete items of truncated responses.
+
+    Missing items are requested in up to MAX_CONTINUATION_CALLS follow-up
+    calls that list what was already generated.
+    """
+    items = stream_json_items(model, prompt, kind, section_id, retry=retry)
+    for attempt in range(1, MAX_CONTINUATION_CALLS + 1):
+        missing = count - len(items)
+        if missing <= 0:
+            break
+        print(f"    Salvaged {len(items)}/{count} items, requesting the remaining {missing}...")
+        items += stream_json_items(model, continuation_prompt(prompt, items, missing), kind, section_id, attempt, retry)
+    
+    if not items:
+        raise ValueError("Model response contained no complete JSON items")
+    return items
+
+
+def parse_json_response(text: str, opener: str = '[') -> tuple:
+    """Parse a JSON response, falling back to the outermost [...] or {...} span.
+
+    Returns (result, used_fallback).
+    """
+    closer = ']' if opener == '[' else '}'
+    text = fix_json_string(text)
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        # Try to extract JSON from response
+        start = text.find(opener)
+        end = text.rfind(closer) + 1
+        if start >= 0 and end > start:
+            return json.loads(text[start:end]), True
+        raise
+
+
+def generate_json(model, prompt: str, opener: str = '[', kind: str = '', section_id: Optional[str] = None,
+                  retry: int = 0):
+    """Get a parsed JSON response for a prompt, served from the response cache when possible.
+
+    Only responses that parse are cached, so a malformed answer is retried on
+    the next run.
+    """
+    started = time.perf_counter()
+    timing = {}
+    model_name, key = _cache_key(model, prompt)
+    
+    if response_cache is not None:
+        cached = response_cache.get(key)
+        if cached is not None:
+            result, fallback = parse_json_response(cached, opener)
+            log_call(kind, section_id, prompt, cached, started, timing, retry, fallback=fallback, cached=True)
+            return result
+    
+    text = ''
+    try:
+        text = call_model(model, prompt, timing)
+        result, fallback = parse_json_response(text, opener)
+    except Exception as e:
+        log_call(kind, section_id, prompt, text, started, timing, retry, fallback=True, error=str(e))
+        raise
+    log_call(kind, section_id, prompt, text, started, timing, retry, fallback=fallback)
+    if response_cache is not None:
+        response_cache.put(key, model_name, prompt, text)
+    return result
+
+
+def vocabulary_prompt(topic: str, count: int, focus: str = "", avoid: Optional[list] = None) -> str:
+    """Prompt for count vocabulary items, optionally focused on some keywords and avoiding known terms."""
     prompt = f"""As a German language professor specializing in Medical German for foreign doctors, generate exactly {count} vocabulary items for the topic: "{topic}"
 
 For each vocabulary item, provide a JSON object with:
@@ -127,21 +892,67 @@ For each vocabulary item, provide a JSON object with:
 
 Return ONLY a valid JSON array of {count} vocabulary objects. No markdown, no explanation."""
 
-    response = model.generate_content(prompt)
-    try:
-        text = fix_json_string(response.text)
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Try to extract JSON from response
-        text = fix_json_string(response.text)
-        start = text.find('[')
-        end = text.rfind(']') + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        raise
+    if focus:
+        prompt += f"\n\nConcentrate on: {focus}"
+    if avoid:
+        prompt += f"\n\nDo NOT include any of these terms: {', '.join(avoid)}"
+    return prompt
 
 
-def generate_dialogues(model, topic: str, count: int = 5) -> list:
+def generate_vocabulary(model, topic: str, count: int = 30, section_id: Optional[str] = None, retry: int = 0) -> list:
+    """Generate vocabulary items using AI, in parallel chunks of VOCAB_CHUNK_SIZE.
+
+    Items are deduplicated on germanTerm and article within the section and,
+    when a term index is loaded, against every other section.
+    """
+    _, _, keywords = topic.partition(':')
+    keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+    chunks = [min(VOCAB_CHUNK_SIZE, count - start) for start in range(0, count, VOCAB_CHUNK_SIZE)]
+    
+    # Spread the topic keywords over the chunks so they overlap less
+    futures = [
+        vocab_chunk_executor.submit(
+            generate_items, model,
+            vocabulary_prompt(topic, size, ', '.join(keywords[i::len(chunks)]) if len(chunks) > 1 else ""),
+            size, 'vocabulary', section_id, retry,
+        )
+        for i, size in enumerate(chunks)
+    ]
+    
+    vocab = []
+    seen = set()
+    rejected = []
+    
+    def merge(items):
+        for item in items:
+            if len(vocab) >= count or not isinstance(item, dict):
+                continue
+            key = term_key(item)
+            if not key[1] or key in seen:
+                continue
+            seen.add(key)
+            if term_index is not None and section_id and not term_index.claim(item, section_id):
+                rejected.append(item.get('germanTerm', ''))
+                continue
+            vocab.append(item)
+    
+    for future in futures:
+        merge(future.result())
+    
+    # Top up what deduplication removed, telling the model which terms to skip
+    for _ in range(MAX_CONTINUATION_CALLS):
+        missing = count - len(vocab)
+        if missing <= 0:
+            break
+        print(f"    Requesting {missing} more vocabulary items to replace duplicates...")
+        avoid = [item.get('germanTerm', '') for item in vocab] + rejected
+        merge(generate_items(model, vocabulary_prompt(topic, missing, avoid=avoid), missing, 'vocabulary', section_id,
+                             retry))
+    
+    return vocab
+
+
+def generate_dialogues(model, topic: str, count: int = 5, section_id: Optional[str] = None, retry: int = 0) -> list:
     """Generate dialogue scenarios using AI."""
     prompt = f"""As a German language professor for Medical German, create {count} realistic hospital dialogues about: "{topic}"
 
@@ -158,20 +969,10 @@ Return a JSON array where each dialogue has:
 
 Return ONLY valid JSON array. No markdown."""
 
-    response = model.generate_content(prompt)
-    try:
-        text = fix_json_string(response.text)
-        return json.loads(text)
-    except json.JSONDecodeError:
-        text = fix_json_string(response.text)
-        start = text.find('[')
-        end = text.rfind(']') + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        raise
+    return generate_items(model, prompt, count, 'dialogues', section_id, retry)
 
 
-def generate_exercises(model, topic: str, count: int = 18) -> list:
+def generate_exercises(model, topic: str, count: int = 18, section_id: Optional[str] = None, retry: int = 0) -> list:
     """Generate practice exercises using AI."""
     prompt = f"""Create {count} FSP-exam style exercises for Medical German topic: "{topic}"
 
@@ -190,21 +991,11 @@ Each exercise needs:
 
 Return ONLY valid JSON array. No markdown."""
 
-    response = model.generate_content(prompt)
-    try:
-        text = fix_json_string(response.text)
-        return json.loads(text)
-    except json.JSONDecodeError:
-        text = fix_json_string(response.text)
-        start = text.find('[')
-        end = text.rfind(']') + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        raise
+    return generate_items(model, prompt, count, 'exercises', section_id, retry)
 
 
 
-def generate_metadata(model, topic: str) -> dict:
+def generate_metadata(model, topic: str, section_id: Optional[str] = None, retry: int = 0) -> dict:
     """Generate multilingual metadata and text content."""
     prompt = f"""As a German language professor for Medical German, create multilingual metadata for the section topic: "{topic}"
 
@@ -224,27 +1015,205 @@ def generate_metadata(model, topic: str) -> dict:
     
     Return ONLY valid JSON."""
 
-    response = model.generate_content(prompt)
-    try:
-        text = fix_json_string(response.text)
-        return json.loads(text)
-    except json.JSONDecodeError:
-        text = fix_json_string(response.text)
-        start = text.find('{')
-        end = text.rfind('}') + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        raise
+    return generate_json(model, prompt, '{', 'metadata', section_id, retry)
+
+class SectionStaging:
+    """Components of a section generated so far, written to disk as each one completes."""
+
+    def __init__(self, section_num: int, directory: Path = STAGING_DIR):
+        self.path = Path(directory) / f"section_{section_num:02d}.json"
+        self.lock = threading.Lock()
+        self.components = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.components = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.components = {}
+
+    def done(self, component: str) -> bool:
+        return component in self.components
+
+    def get(self, component: str):
+        return self.components.get(component)
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.components, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.path)
 
-def populate_section(model, section_num: int, existing_file: Optional[Path] = None, metadata_only: bool = False) -> dict:
-    """Populate a section with AI-generated content."""
+    def save(self, component: str, value):
+        with self.lock:
+            self.components[component] = value
+            self._write()
+
+    def discard(self, components: list):
+        """Drop components merged into the section file; delete the file once nothing is left."""
+        with self.lock:
+            if not any(c in self.components for c in components):
+                return
+            for component in components:
+                self.components.pop(component, None)
+            if self.components:
+                self._write()
+            else:
+                self.path.unlink(missing_ok=True)
+
+    def clear(self):
+        with self.lock:
+            self.components = {}
+            self.path.unlink(missing_ok=True)
+
+
+def with_retries(label: str, fn, *args):
+    """Call fn(*args, retry=n), retrying up to COMPONENT_ATTEMPTS times with exponential backoff.
+
+    n is the number of failed attempts so far, so the metrics log can tell retries from first calls.
+    """
+    for attempt in range(1, COMPONENT_ATTEMPTS + 1):
+        try:
+            return fn(*args, retry=attempt - 1)
+        except Exception as e:
+            if attempt == COMPONENT_ATTEMPTS:
+                raise
+            delay = COMPONENT_RETRY_DELAY * 2 ** (attempt - 1) * random.uniform(0.75, 1.25)
+            print(f"    ⚠ {label} failed ({str(e)[:60]}), retry {attempt}/{COMPONENT_ATTEMPTS - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def generate_component(model, component: str, topic: str, section_id: str, retry: int = 0):
+    """Generate one section component by name."""
+    if component == "metadata":
+        return generate_metadata(model, topic, section_id, retry)
+    generator = {
+        "vocabulary": generate_vocabulary,
+        "dialogues": generate_dialogues,
+        "exercises": generate_exercises,
+    }[component]
+    return generator(model, topic, COMPONENT_COUNTS[component], section_id, retry)
+
+
+def run_component(model, staging: SectionStaging, section_num: int, component: str, topic: str, section_id: str):
+    """Generate a component with retries and stage it as soon as it succeeds."""
+    value = with_retries(f"[{section_num}] {component}", generate_component, model, component, topic, section_id)
+    staging.save(component, value)
+    print(f"  [{section_num}] ✓ {component} staged")
+
+
+def metadata_pack_prompt(section_nums: list) -> str:
+    """Prompt asking for the metadata of several sections in one JSON object keyed by section number."""
+    topics = '\n'.join(
+        f'"{num}": "{SECTION_TOPICS[num][0]}: {SECTION_TOPICS[num][1]}"' for num in section_nums
+    )
+    return f"""As a German language professor for Medical German, create multilingual metadata for each of these section topics:
+{topics}
+
+For EACH topic generate:
+1. Title in 5 languages (Medical German context)
+2. Description (1 sentence) in 5 languages
+3. Introduction (2 sentences explaining what will be learned) in 5 languages
+4. Grammar Focus (1-2 bullet points) in 5 languages. MUST be a single string with markdown bullets (e.g. "- Point 1\\n- Point 2")
+5. Cultural Notes (1 relevant point) in 5 languages. MUST be a single string.
+6. Summary (1 sentence wrap-up) in 5 languages. MUST be a single string.
+7. Learning Objectives (4 bullet points in English)
+
+The 5 languages are: {', '.join(LANGUAGES)}.
+Output ONE JSON object whose keys are the section numbers above (as strings) and whose values are objects with keys: title, description, textContent, learningObjectives.
+textContent must have keys: {', '.join(METADATA_TEXT_KEYS)}.
+Each lowest level value (e.g. textContent.grammarFocus.en) MUST be a STRING, not an object/array.
+learningObjectives should be a simple array of strings (English).
+
+Return ONLY valid JSON."""
+
+
+def validate_metadata(metadata) -> list:
+    """Return the problems that keep a metadata object from being merged (empty if valid)."""
+    if not isinstance(metadata, dict):
+        return ["not an object"]
+    problems = []
+    
+    def check_languages(name, value):
+        if not isinstance(value, dict):
+            problems.append(f"{name} is not an object")
+            return
+        missing = [lang for lang in LANGUAGES if not isinstance(value.get(lang), str) or not value[lang].strip()]
+        if missing:
+            problems.append(f"{name} lacks {', '.join(missing)}")
+    
+    check_languages("title", metadata.get("title"))
+    check_languages("description", metadata.get("description"))
+    text_content = metadata.get("textContent")
+    if not isinstance(text_content, dict):
+        problems.append("textContent is not an object")
+    else:
+        for key in METADATA_TEXT_KEYS:
+            check_languages(f"textContent.{key}", text_content.get(key))
+    objectives = metadata.get("learningObjectives")
+    if not isinstance(objectives, list) or not objectives or not all(isinstance(o, str) for o in objectives):
+        problems.append("learningObjectives is not a list of strings")
+    return problems
+
+
+def pack_metadata(model, section_nums: list, pack_size: int, fresh: bool = False):
+    """Generate metadata for pack_size sections per request and stage every valid object.
+
+    Sections whose object is missing or invalid are left unstaged, so
+    populate_section requests them individually afterwards.
+    """
+    pending = []
+    for section_num in section_nums:
+        staging = SectionStaging(section_num, STAGING_DIR)
+        if fresh:
+            staging.clear()
+        if not staging.done("metadata"):
+            pending.append((section_num, staging))
+    if not pending:
+        return
+    
+    packs = [pending[i:i + pack_size] for i in range(0, len(pending), pack_size)]
+    print(f"Packing metadata for {len(pending)} sections into {len(packs)} requests...")
+    futures = [
+        generator_executor.submit(
+            generate_json, model, metadata_pack_prompt([num for num, _ in pack]), '{',
+            "metadata-pack", ",".join(f"section_{num:02d}" for num, _ in pack),
+        )
+        for pack in packs
+    ]
+    
+    staged = 0
+    for pack, future in zip(packs, futures):
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"  ⚠ Packed metadata for sections {pack[0][0]}-{pack[-1][0]} failed: {str(e)[:60]}")
+            continue
+        for section_num, staging in pack:
+            metadata = results.get(str(section_num)) if isinstance(results, dict) else None
+            problems = validate_metadata(metadata)
+            if problems:
+                print(f"  [{section_num}] ⚠ Packed metadata invalid ({problems[0]}), requesting it alone")
+                continue
+            staging.save("metadata", metadata)
+            staged += 1
+    print(f"Packed metadata: {staged}/{len(pending)} sections staged")
+
+
+def populate_section(model, section_num: int, existing_file: Optional[Path] = None, metadata_only: bool = False,
+                     staging: Optional[SectionStaging] = None) -> dict:
+    """Populate a section with AI-generated content.
+
+    Components already in the staging file are reused. If any component
+    still fails after its retries, the others stay staged and RuntimeError
+    is raised.
+    """
     topic_name, topic_keywords = SECTION_TOPICS[section_num]
     full_topic = f"{topic_name}: {topic_keywords}"
     
     # Load existing file to preserve structure
     if existing_file and existing_file.exists():
-        with open(existing_file, 'r', encoding='utf-8') as f:
-            section = json.load(f)
+        section = repository.section(file_section_id(existing_file.name))
     else:
         section = {
             "id": f"section_{section_num:02d}",
@@ -253,9 +1222,35 @@ def populate_section(model, section_num: int, existing_file: Optional[Path] = No
             "level": "A1" if section_num <= 7 else ("A2" if section_num <= 12 else ("B1" if section_num <= 20 else ("B2" if section_num <= 29 else "C1")))
         }
 
+    if staging is None:
+        staging = SectionStaging(section_num)
+    components = ["metadata"] if metadata_only else list(COMPONENT_COUNTS)
+    missing = [c for c in components if not staging.done(c)]
+    if len(missing) < len(components):
+        print(f"  [{section_num}] Reusing staged: {', '.join(c for c in components if staging.done(c))}")
+    
+    # The components are independent, so generate them concurrently
+    if missing:
+        print(f"  [{section_num}] Generating {', '.join(missing)}...")
+    futures = {
+        component: generator_executor.submit(
+            run_component, model, staging, section_num, component, full_topic, section["id"]
+        )
+        for component in missing
+    }
+    failed = []
+    for component, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            print(f"  [{section_num}] ✗ {component} failed after {COMPONENT_ATTEMPTS} attempts: {str(e)[:80]}")
+            failed.append(component)
+    if failed:
+        staged = [c for c in components if staging.done(c)]
+        raise RuntimeError(f"missing {', '.join(failed)}; {len(staged)} component(s) staged for the next run")
+
     if metadata_only:
-        print(f"\n  Generating metadata & text content...")
-        metadata = generate_metadata(model, full_topic)
+        metadata = staging.get("metadata")
         
         # Merge metadata
         if "title" in metadata:
@@ -271,16 +1266,9 @@ def populate_section(model, section_num: int, existing_file: Optional[Path] = No
         
         return section
 
-    print(f"\n  Generating vocabulary ({30} items)...")
-    vocab = generate_vocabulary(model, full_topic, 30)
-    time.sleep(1)  # Rate limiting
-    
-    print(f"  Generating dialogues ({5} dialogues)...")
-    dialogues = generate_dialogues(model, full_topic, 5)
-    time.sleep(1)
-    
-    print(f"  Generating exercises ({18} questions)...")
-    exercises = generate_exercises(model, full_topic, 18)
+    vocab = staging.get("vocabulary")
+    dialogues = staging.get("dialogues")
+    exercises = staging.get("exercises")
     
     # Add IDs to generated content
     for i, v in enumerate(vocab, 1):
@@ -299,28 +1287,98 @@ def populate_section(model, section_num: int, existing_file: Optional[Path] = No
     return section
 
 
+def process_section(model, section_num: int, metadata_only: bool = False, fresh: bool = False) -> bool:
+    """Populate one section and save it. Returns True on success.
+
+    Staged components are discarded once they are merged into the written
+    section file, or all of them up front when fresh is set. Components the
+    run did not merge (e.g. vocabulary left by a failed full run, during a
+    --metadata run) stay staged.
+    """
+    topic_name = SECTION_TOPICS[section_num][0]
+    print(f"\n[{section_num}/55] Processing: {topic_name}")
+    
+    # Find existing file
+    existing = repository.path(f"section_{section_num:02d}")
+    
+    staging = SectionStaging(section_num, STAGING_DIR)
+    if fresh:
+        staging.clear()
+    
+    try:
+        section = populate_section(model, section_num, existing, metadata_only=metadata_only, staging=staging)
+        
+        # Determine output filename
+        if existing:
+            output_file = existing
+        else:
+            output_file = CONTENT_DIR / f"section_{section_num:02d}.json"
+        
+        written = write_if_changed(output_file, section)
+        repository.update(file_section_id(output_file.name), section, output_file)
+        staging.discard(["metadata"] if metadata_only else list(COMPONENT_COUNTS))
+        
+        print(f"  [{section_num}] ✓ {'Saved' if written else 'Unchanged'}: {output_file.name}")
+        return True
+    
+    except Exception as e:
+        print(f"  [{section_num}] ✗ Error: {e}")
+        return False
+
+
 def main():
+    global model_slots, generator_executor, vocab_chunk_executor, response_cache, term_index, metrics, repository
+    
     import argparse
     parser = argparse.ArgumentParser(description="Populate Medical German content with AI")
     parser.add_argument("--section", type=int, help="Specific section number to populate (1-55)")
     parser.add_argument("--all", action="store_true", help="Populate all sections")
     parser.add_argument("--metadata", action="store_true", help="Populate ONLY metadata/text content")
+    parser.add_argument("--pack", type=int, default=DEFAULT_METADATA_PACK,
+                        help="Sections per metadata request with --metadata (1 = one request per section)")
     parser.add_argument("--start", type=int, default=1, help="Start section for range")
     parser.add_argument("--end", type=int, default=55, help="End section for range")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_SECTIONS_IN_FLIGHT,
+                        help="Sections populated at the same time")
+    parser.add_argument("--max-calls", type=int, default=DEFAULT_MAX_MODEL_CALLS,
+                        help="Maximum concurrent model calls across all sections")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the response cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached responses and staged components but store the new ones")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help="Evict least recently used cache entries beyond this size")
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), default=DEFAULT_PROVIDER,
+                        help="Live Gemini model, recorded cassette replay, or offline synthetic payloads")
+    parser.add_argument("--cassette", type=Path, help="Cassette file for --provider replay")
+    parser.add_argument("--record", type=Path, help="Record every answered prompt into this cassette file")
+    parser.add_argument("--latency", type=float, default=DEFAULT_SIMULATED_LATENCY,
+                        help="Simulated seconds per call for replay/synthetic providers")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Standard deviation of the simulated latency")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for simulated latency and synthetic payloads")
+    parser.add_argument("--metrics-path", type=Path, default=METRICS_PATH,
+                        help="JSON-lines file that receives one record per model call")
+    parser.add_argument("--stats", action="store_true", help="Summarize the metrics file and exit")
     args = parser.parse_args()
     
-    if not HAS_GENAI:
-        print("ERROR: google-generativeai not installed")
-        print("Run: pip install google-generativeai")
-        sys.exit(1)
+    if args.stats:
+        print_stats(args.metrics_path)
+        return
     
-    if not os.environ.get("GEMINI_API_KEY"):
-        print("ERROR: GEMINI_API_KEY environment variable not set")
-        sys.exit(1)
+    if args.provider == GeminiProvider.name:
+        if not os.environ.get("GEMINI_API_KEY"):
+            print("ERROR: GEMINI_API_KEY environment variable not set")
+            sys.exit(1)
     
-    model = get_ai_model()
+    try:
+        model = create_provider(args.provider, args.cassette, args.latency, args.jitter, args.seed)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if args.record:
+        model = RecordingProvider(model, args.record)
     print("Medical German AI Content Populator")
     print("=" * 50)
+    print(f"Provider: {model.name} ({model.model_name})")
     
     sections_to_process = []
     if args.section:
@@ -337,39 +1395,43 @@ def main():
     for section_num in sections_to_process:
         if section_num not in SECTION_TOPICS:
             print(f"Unknown section: {section_num}")
-            continue
-        
-        topic_name = SECTION_TOPICS[section_num][0]
-        print(f"\n[{section_num}/55] Processing: {topic_name}")
-        
-        # Find existing file
-        files = list(CONTENT_DIR.glob(f"section_{section_num:02d}*.json"))
-        existing = files[0] if files else None
-        
-        try:
-            section = populate_section(model, section_num, existing, metadata_only=args.metadata)
-            
-            # Determine output filename
-            if existing:
-                output_file = existing
-            else:
-                output_file = CONTENT_DIR / f"section_{section_num:02d}.json"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(section, f, ensure_ascii=False, indent=4)
-            
-            print(f"  ✓ Saved: {output_file.name}")
-            
-            # Rate limiting between sections
-            if section_num != sections_to_process[-1]:
-                time.sleep(2)
-                
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            continue
+    sections_to_process = [n for n in sections_to_process if n in SECTION_TOPICS]
+    
+    if not args.no_cache:
+        response_cache = ResponseCache(CACHE_DIR, args.cache_size_mb * 1024 * 1024, refresh=args.refresh)
+        print(f"Response cache: {CACHE_DIR}{' (refreshing)' if args.refresh else ''}")
+    
+    metrics = MetricsLog(args.metrics_path)
+    model_slots = threading.BoundedSemaphore(args.max_calls)
+    generator_executor = ThreadPoolExecutor(max_workers=3 * args.parallel)
+    vocab_chunk_executor = ThreadPoolExecutor(max_workers=args.max_calls)
+    
+    repository = ContentRepository(sections_dir=CONTENT_DIR)
+    if not args.metadata:
+        term_index = TermIndex(repository)
+        print(f"Vocabulary index: {len(term_index)} existing terms")
+    print(f"Sections in flight: {args.parallel}, concurrent model calls: {args.max_calls}")
+    
+    fresh = args.refresh
+    if args.metadata and args.pack > 1 and len(sections_to_process) > 1:
+        pack_metadata(model, sections_to_process, args.pack, fresh=fresh)
+        fresh = False  # Staging was already reset before packing
+    
+    with ThreadPoolExecutor(max_workers=args.parallel) as section_executor:
+        futures = [
+            section_executor.submit(process_section, model, section_num, args.metadata, fresh)
+            for section_num in sections_to_process
+        ]
+        succeeded = sum(1 for future in as_completed(futures) if future.result())
+    generator_executor.shutdown()
+    vocab_chunk_executor.shutdown()
+    model.close()
+    metrics.close()
     
     print("\n" + "=" * 50)
-    print("Content population complete!")
+    print(f"Content population complete! {succeeded}/{len(sections_to_process)} sections saved.")
+    if response_cache is not None:
+        print(f"Response cache: {response_cache.hits} hits, {response_cache.misses} misses")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Shared access to the app content for the content scripts.
+Sections, phases.json and mock tests are found by directory listing and
+parsed only when first requested, then cached. Vocabulary, dialogue and
+exercise ids carry their section number (v19_03, d01a_02), so an item
+lookup parses just the section that owns it.
+
+Usage:
+    from content_repository import ContentRepository
+    repository = ContentRepository()
+    section = repository.section("section_19")
+    term = repository.vocabulary("v19_03")
+
+Section writers use write_if_changed(), which leaves a file alone when it
+already holds the same JSON and otherwise replaces it atomically. Files are
+parsed and serialized with json_codec (orjson when installed).
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+import json_codec
+
+CONTENT_ROOT = Path(__file__).parent.parent / "content"
+
+# section_01_greetings.json, section_01a_articles.json, section_19.json
+SECTION_FILE_RE = re.compile(r'section_(\d+)([a-z]?)')
+# v19_03, d01a_02, e55_18
+ITEM_ID_RE = re.compile(r'^([vde])(\d+[a-z]?)_')
+ITEM_KINDS = {'v': 'vocabulary', 'd': 'dialogues', 'e': 'exercises'}
+
+
+def section_code(filename: str) -> Optional[str]:
+    """'section_01a_articles.json' -> '01a', 'section_19.json' -> '19'."""
+    match = SECTION_FILE_RE.search(filename)
+    return match.group(1) + match.group(2) if match else None
+
+
+def section_number(filename: str) -> Optional[int]:
+    """'section_01a_articles.json' -> 1, 'section_19.json' -> 19."""
+    match = SECTION_FILE_RE.search(filename)
+    return int(match.group(1)) if match else None
+
+
+def section_id(filename: str) -> Optional[str]:
+    """Id of the section stored in a file: 'section_01a_articles.json' -> 'section_01a'."""
+    code = section_code(filename)
+    return f"section_{code}" if code else None
+
+
+def write_if_changed(path: Path, data) -> bool:
+    """Write data as section JSON unless the file already holds exactly these bytes; return True if written.
+
+    The new content goes to a temporary file in the same directory that is
+    then renamed over the target, so an interrupted run never leaves a
+    truncated file behind.
+    """
+    path = Path(path)
+    content = json_codec.dumps(data)
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    # Hidden name, so section_*.json listings never pick it up
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+class ContentRepository:
+    """Lazily loaded, cached view of content/sections, phases.json and mock_tests."""
+
+    def __init__(self, root: Path = CONTENT_ROOT, sections_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.sections_dir = Path(sections_dir) if sections_dir else self.root / "sections"
+        self.phases_path = self.root / "phases.json"
+        self.mock_tests_dir = self.root / "mock_tests"
+        self.lock = threading.RLock()
+        self._paths = None
+        self._sections = {}
+        self._items = {}
+        self._phases = None
+        self._mock_test_files = {}
+        self._mock_tests = None
+
+    @staticmethod
+    def _load(path: Path):
+        return json_codec.load(path)
+
+    # Sections
+
+    def section_paths(self) -> dict:
+        """Section id -> file path, in file name order. Lists the directory once, parses nothing."""
+        with self.lock:
+            if self._paths is None:
+                self._paths = {}
+                for path in sorted(self.sections_dir.glob("section_*.json")):
+                    self._paths.setdefault(section_id(path.name), path)
+            return self._paths
+
+    def section_ids(self) -> list:
+        return list(self.section_paths())
+
+    def path(self, section_id: str) -> Optional[Path]:
+        return self.section_paths().get(section_id)
+
+    def section(self, section_id: str) -> dict:
+        """Parsed section by id; raises KeyError for unknown ids and JSON errors for broken files."""
+        with self.lock:
+            section = self._sections.get(section_id)
+            if section is None:
+                path = self.section_paths()[section_id]
+                section = self._load(path)
+                self._sections[section_id] = section
+                self._index_items(section)
+            return section
+
+    def sections(self) -> Iterator[tuple]:
+        """Yield (section id, path, section) for every section, parsing each file on first use."""
+        for section_id, path in self.section_paths().items():
+            yield section_id, path, self.section(section_id)
+
+    def update(self, section_id: str, section: dict, path: Optional[Path] = None):
+        """Replace the cached copy of a section after the caller wrote it (or a new file) to disk."""
+        with self.lock:
+            if path is not None:
+                self.section_paths()[section_id] = path
+            self._sections[section_id] = section
+            self._index_items(section)
+
+    # Items
+
+    def _index_items(self, section: dict):
+        for kind in ITEM_KINDS.values():
+            for item in section.get(kind, []) or []:
+                if isinstance(item, dict) and item.get("id"):
+                    self._items[item["id"]] = item
+
+    def item(self, item_id: str) -> dict:
+        """Vocabulary, dialogue or exercise by id, loading only the section named in the id."""
+        with self.lock:
+            if item_id not in self._items:
+                match = ITEM_ID_RE.match(item_id)
+                owner = f"section_{match.group(2)}" if match else None
+                if owner in self.section_paths():
+                    self.section(owner)
+                if item_id not in self._items:
+                    # Id does not follow the naming scheme: fall back to loading everything
+                    for _ in self.sections():
+                        pass
+            return self._items[item_id]
+
+    def _typed_item(self, item_id: str, kind: str) -> dict:
+        if ITEM_KINDS.get(item_id[:1]) != kind:
+            raise KeyError(f"{item_id} is not a {kind} id")
+        return self.item(item_id)
+
+    def vocabulary(self, item_id: str) -> dict:
+        return self._typed_item(item_id, "vocabulary")
+
+    def dialogue(self, item_id: str) -> dict:
+        return self._typed_item(item_id, "dialogues")
+
+    def exercise(self, item_id: str) -> dict:
+        return self._typed_item(item_id, "exercises")
+
+    # Phases and mock tests
+
+    def phases(self) -> list:
+        with self.lock:
+            if self._phases is None:
+                data = self._load(self.phases_path)
+                self._phases = data.get("phases", []) if isinstance(data, dict) else []
+            return self._phases
+
+    def phase(self, phase_id: str) -> dict:
+        for phase in self.phases():
+            if phase.get("id") == phase_id:
+                return phase
+        raise KeyError(phase_id)
+
+    def mock_test_paths(self) -> list:
+        return sorted(self.mock_tests_dir.glob("*.json"))
+
+    def mock_test_file(self, path: Path) -> dict:
+        """Parsed mock test file, loaded on first request."""
+        with self.lock:
+            test = self._mock_test_files.get(path)
+            if test is None:
+                test = self._load(path)
+                self._mock_test_files[path] = test
+            return test
+
+    def mock_tests(self) -> dict:
+        """Mock test id -> test, for every file in content/mock_tests."""
+        with self.lock:
+            if self._mock_tests is None:
+                self._mock_tests = {}
+                for path in self.mock_test_paths():
+                    test = self.mock_test_file(path)
+                    self._mock_tests[test.get("id", path.stem)] = test
+            return self._mock_tests
+
+    def mock_test(self, test_id: str) -> dict:
+        return self.mock_tests()[test_id]
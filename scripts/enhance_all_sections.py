@@ -24,10 +24,11 @@ The script will:
 
 import json
 import os
-import re
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from content_repository import ContentRepository, section_id, section_number, write_if_changed
+
 SECTIONS_DIR = Path(__file__).parent.parent / "content" / "sections"
 
 # ============================================================================
@@ -1531,16 +1532,6 @@ SECTION_TOPICS = {
     "section_55": ("Future of Medicine", "Zukunft der Medizin", "Innovationssprache"),
 }
 
-def get_section_key(filename: str) -> str:
-    """Extract section key from filename."""
-    match = re.search(r'(section_\d+)', filename)
-    return match.group(1) if match else ""
-
-def get_section_number(filename: str) -> int:
-    """Extract section number from filename."""
-    match = re.search(r'section_(\d+)', filename)
-    return int(match.group(1)) if match else 0
-
 def generate_grammar_for_section(section_key: str, section_data: Dict) -> Dict:
     """Generate enhanced grammar content based on section topic."""
     
@@ -1613,11 +1604,12 @@ def add_audio_urls_to_vocabulary(section_data: Dict, section_num: int) -> bool:
     
     return modified
 
-def process_section(filepath: Path) -> Dict:
+def process_section(filepath: Path, repository: ContentRepository) -> Dict:
     """Process a single section file and return results."""
     filename = filepath.name
-    section_key = get_section_key(filename)
-    section_num = get_section_number(filename)
+    section_num = section_number(filename) or 0
+    # Supplementary files such as section_01a share the tables of their numbered section
+    section_key = f"section_{section_num:02d}"
     
     result = {
         "file": filename,
@@ -1629,8 +1621,7 @@ def process_section(filepath: Path) -> Dict:
     }
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            section_data = json.load(f)
+        section_data = repository.section(section_id(filename))
     except json.JSONDecodeError as e:
         result["error"] = f"JSON error: {e}"
         return result
@@ -1662,8 +1653,7 @@ def process_section(filepath: Path) -> Dict:
     # Save if modified
     if modified:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(section_data, f, ensure_ascii=False, indent=4)
+            write_if_changed(filepath, section_data)
         except Exception as e:
             result["error"] = f"Write error: {e}"
     
@@ -1681,7 +1671,8 @@ def main():
         print(f"ERROR: Sections directory not found: {SECTIONS_DIR}")
         return
     
-    section_files = sorted(SECTIONS_DIR.glob("section_*.json"))
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
+    section_files = list(repository.section_paths().values())
     
     if not section_files:
         print("No section files found!")
@@ -1693,7 +1684,7 @@ def main():
     results = []
     for filepath in section_files:
         print(f"Processing: {filepath.name}...", end=" ")
-        result = process_section(filepath)
+        result = process_section(filepath, repository)
         results.append(result)
         
         status = []
@@ -7,10 +7,11 @@ This script transforms the grammarFocus section from brief bullet points
 to comprehensive grammar lessons with examples in all 6 languages.
 """
 
-import json
 import os
 from pathlib import Path
 
+from content_repository import ContentRepository, section_code, write_if_changed
+
 CONTENT_DIR = Path(__file__).parent.parent / "content" / "sections"
 
 # Enhanced grammar content for each section topic
@@ -84,21 +85,12 @@ def generate_enhanced_grammar(section_num: str, topic: str) -> dict:
     return ENHANCED_GRAMMAR.get(section_num, default_grammar)
 
 
-def enhance_grammar_in_section(json_path: Path) -> bool:
-    """Enhance the grammarFocus section with more elaborative content."""
-    
-    filename = json_path.stem
-    parts = filename.split('_')
-    section_num = parts[1]
-    
-    # Skip if already enhanced or special section
-    if 'a' in section_num:
-        print(f"  Skipping {filename} (special section)")
+def apply_enhanced_grammar(section_num: str, data: dict) -> bool:
+    """Replace grammarFocus with the ENHANCED_GRAMMAR points of a section; False if it has none."""
+    # Only update if we have predefined content for this section (01, 02)
+    if section_num not in ENHANCED_GRAMMAR:
         return False
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     # Get or generate enhanced grammar
     topic = data.get('titleDe', 'Medical German')
     enhanced = generate_enhanced_grammar(section_num, topic)
@@ -107,11 +99,6 @@ def enhance_grammar_in_section(json_path: Path) -> bool:
     text_content = data.get('textContent', {})
     current_grammar = text_content.get('grammarFocus', {})
     
-    # Only update if we have predefined content for this section (01, 02)
-    if section_num not in ENHANCED_GRAMMAR:
-        print(f"  - {filename} (no enhanced grammar defined, skipping)")
-        return False
-    
     # Convert list of points to combined string format
     new_grammar = {}
     for lang in ["en", "de", "bn", "hi", "ur", "tr"]:
@@ -122,9 +109,27 @@ def enhance_grammar_in_section(json_path: Path) -> bool:
             new_grammar[lang] = current_grammar.get(lang, {})
     
     data['textContent']['grammarFocus'] = new_grammar
+    return True
+
+
+def enhance_grammar_in_section(json_path: Path, data: dict) -> bool:
+    """Enhance the grammarFocus section with more elaborative content."""
     
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    filename = json_path.stem
+    section_num = section_code(filename)
+    
+    # Skip if already enhanced or special section
+    if 'a' in section_num:
+        print(f"  Skipping {filename} (special section)")
+        return False
+    
+    if not apply_enhanced_grammar(section_num, data):
+        print(f"  - {filename} (no enhanced grammar defined, skipping)")
+        return False
+    
+    if not write_if_changed(json_path, data):
+        print(f"  - {filename} (already enhanced)")
+        return False
     
     print(f"  ✓ Enhanced {filename}")
     return True
@@ -134,11 +139,11 @@ def main():
     print("Enhancing grammar content in section files...")
     print("=" * 60)
     
-    json_files = sorted(CONTENT_DIR.glob("section_*.json"))
+    repository = ContentRepository(sections_dir=CONTENT_DIR)
     enhanced_count = 0
     
-    for json_path in json_files:
-        if enhance_grammar_in_section(json_path):
+    for _, json_path, data in repository.sections():
+        if enhance_grammar_in_section(json_path, data):
             enhanced_count += 1
     
     print("=" * 60)
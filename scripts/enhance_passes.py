@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Run the section enhancements as passes over one load of each section.
+Grammar enhancement, dialogue audio URLs, vocabulary audio URLs and
+learning objective conversion are registered passes; so are the grammar
+points of enhance_grammar.py, which are opt-in because they rewrite
+grammarFocus in a different format. Every section is
+loaded once, run through the selected passes and written once (only if the
+passes changed it), instead of each enhancement script reading and
+rewriting all section files in turn. The result matches running
+enhance_all_sections.py, enhance_sections.py, enhance_remaining_sections.py,
+add_audio_urls.py and fix_audio_and_translations.py one after another
+(enhance_grammar.py too, with --passes including grammar-points).
+With --jobs, sections are processed in worker processes; results are
+reported in file order, so the output is the same as a serial run.
+
+Usage:
+    python enhance_passes.py                                  # Default passes
+    python enhance_passes.py --passes grammar,grammar-points  # Include an opt-in pass
+    python enhance_passes.py --passes grammar,objectives      # Selected passes
+    python enhance_passes.py --dry-run                        # Report changes, write nothing
+    python enhance_passes.py --jobs 8                         # Eight worker processes
+    python enhance_passes.py --list
+"""
+
+import argparse
+import copy
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import enhance_all_sections
+import enhance_grammar
+import enhance_remaining_sections
+import enhance_sections
+from content_repository import ContentRepository, section_code, section_number, write_if_changed
+from fix_audio_and_translations import (fill_grammar_languages, fix_dialogue_audio, fix_learning_objectives,
+                                        fix_vocabulary_audio)
+
+SECTIONS_DIR = Path(__file__).parent.parent / "content" / "sections"
+
+
+def set_grammar(section: dict, grammar: dict):
+    # Copy so later passes never edit the shared enhancement tables
+    section.setdefault("textContent", {})["grammarFocus"] = copy.deepcopy(grammar)
+
+
+def grammar_pass(section: dict, file_id: str) -> int:
+    """Grammar tables of enhance_all_sections, enhance_sections and enhance_remaining_sections, in that order."""
+    # Supplementary files such as section_01a share the tables of their numbered section
+    section_key = f"section_{section_number(file_id) or 0:02d}"
+    before = copy.deepcopy(section.get("textContent", {}).get("grammarFocus"))
+
+    grammar = enhance_all_sections.generate_grammar_for_section(section_key, section)
+    if grammar:
+        set_grammar(section, grammar)
+    if section_key in enhance_sections.GRAMMAR_ENHANCEMENTS:
+        grammar = enhance_sections.enhance_grammar_focus(section, section_key)
+        if grammar:
+            set_grammar(section, grammar)
+    if section_key in enhance_remaining_sections.GRAMMAR_ENHANCEMENTS:
+        set_grammar(section, enhance_remaining_sections.GRAMMAR_ENHANCEMENTS[section_key])
+
+    return int(section.get("textContent", {}).get("grammarFocus") != before)
+
+
+def grammar_points_pass(section: dict, file_id: str) -> int:
+    """ENHANCED_GRAMMAR points of enhance_grammar; supplementary sections such as 01a are skipped."""
+    code = section_code(file_id) or ""
+    if 'a' in code:
+        return 0
+    before = copy.deepcopy(section.get("textContent", {}).get("grammarFocus"))
+    if not enhance_grammar.apply_enhanced_grammar(code, section):
+        return 0
+    return int(section["textContent"]["grammarFocus"] != before)
+
+
+def dialogue_audio_pass(section: dict, file_id: str) -> int:
+    return fix_dialogue_audio(section, section.get("id", file_id))
+
+
+def vocabulary_audio_pass(section: dict, file_id: str) -> int:
+    return fix_vocabulary_audio(section, section.get("id", file_id))
+
+
+def objectives_pass(section: dict, file_id: str) -> int:
+    return int(fix_learning_objectives(section)) + len(fill_grammar_languages(section))
+
+
+# name -> (pass, summary); passes always run in this order.
+# Each pass edits the section in place; the report diffs the section around every pass.
+PASSES = {
+    "grammar": (grammar_pass, "Enhanced grammarFocus from the grammar tables"),
+    "grammar-points": (grammar_points_pass, "grammarFocus from enhance_grammar's point lists (opt-in)"),
+    "dialogue-audio": (dialogue_audio_pass, "audioUrl for every dialogue line"),
+    "vocabulary-audio": (vocabulary_audio_pass, "audioUrl for every vocabulary item"),
+    "objectives": (objectives_pass, "Multilingual learningObjectives, English grammarFocus fallback"),
+}
+
+
+# Passes run when --passes is not given
+DEFAULT_PASSES = [name for name in PASSES if name != "grammar-points"]
+
+
+def parse_passes(selector: str) -> list:
+    """'grammar,objectives' -> pass names in run order; raises ValueError for unknown names."""
+    names = {name.strip() for name in selector.split(",") if name.strip()}
+    unknown = sorted(names - set(PASSES))
+    if unknown:
+        raise ValueError(f"Unknown passes: {', '.join(unknown)} (available: {', '.join(PASSES)})")
+    return [name for name in PASSES if name in names]
+
+
+# Stands in for a key one side of a comparison lacks
+MISSING = object()
+
+
+def changed_values(before, after, path: tuple = ()) -> set:
+    """Paths of the values that differ between before and after, down to the smallest differing value."""
+    if isinstance(before, dict) and isinstance(after, dict):
+        paths = set()
+        for key in before.keys() | after.keys():
+            paths |= changed_values(before.get(key, MISSING), after.get(key, MISSING), path + (key,))
+        return paths
+    if isinstance(before, list) and isinstance(after, list) and len(before) == len(after):
+        paths = set()
+        for position, (old, new) in enumerate(zip(before, after)):
+            paths |= changed_values(old, new, path + (position,))
+        return paths
+    return set() if before == after else {path}
+
+
+def run_passes(section: dict, file_id: str, pass_names: list) -> dict:
+    """Run the passes over one section; return pass name -> number of values it changed for good.
+
+    A value counts for the last pass that changed it, and only if it differs
+    from the section as loaded: a later pass can undo an earlier one (grammar
+    tables lack the fallback languages objectives adds), and a run that
+    changes nothing reports nothing.
+    """
+    original = copy.deepcopy(section)
+    changed_by = {}
+    for name in pass_names:
+        before = copy.deepcopy(section)
+        PASSES[name][0](section, file_id)
+        for path in changed_values(before, section):
+            changed_by[path] = name
+    changes = {name: 0 for name in pass_names}
+    for path in changed_values(original, section):
+        changes[changed_by[path]] += 1
+    return changes
+
+
+def process_section(repository: ContentRepository, file_id: str, pass_names: list, dry_run: bool) -> dict:
+    """Load, run and (unless dry_run) write one section; return its result for the report."""
+    filepath = repository.path(file_id)
+    result = {"file": filepath.name, "changes": {}, "written": False, "error": None}
+    try:
+        section = repository.section(file_id)
+    except (OSError, json.JSONDecodeError) as e:
+        result["error"] = str(e)
+        return result
+
+    result["changes"] = run_passes(section, file_id, pass_names)
+    if any(result["changes"].values()):
+        result["written"] = True if dry_run else write_if_changed(filepath, section)
+    return result
+
+
+# Repository of a worker process, set up by init_worker()
+worker_repository = None
+
+
+def init_worker(sections_dir: Path):
+    global worker_repository
+    worker_repository = ContentRepository(sections_dir=sections_dir)
+
+
+def process_in_worker(file_id: str, pass_names: list, dry_run: bool) -> dict:
+    return process_section(worker_repository, file_id, pass_names, dry_run)
+
+
+def process_all(repository: ContentRepository, pass_names: list, dry_run: bool, jobs: int) -> list:
+    """Results for every section in file order, from one process or from a pool of jobs workers."""
+    file_ids = repository.section_ids()
+    if jobs <= 1 or len(file_ids) <= 1:
+        return [process_section(repository, file_id, pass_names, dry_run) for file_id in file_ids]
+
+    chunksize = max(1, len(file_ids) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(repository.sections_dir,)) as pool:
+        # map() yields in input order, whichever worker finishes first
+        return list(pool.map(process_in_worker, file_ids, [pass_names] * len(file_ids),
+                             [dry_run] * len(file_ids), chunksize=chunksize))
+
+
+def print_report(report: dict, section_count: int):
+    """Per-pass summary: sections changed and values changed."""
+    print(f"{'Pass':<18} {'Sections':>9} {'Values':>8}")
+    print("-" * 37)
+    for name, changes in report.items():
+        sections = sum(1 for count in changes.values() if count)
+        print(f"{name:<18} {sections:>4}/{section_count:<4} {sum(changes.values()):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run enhancement passes over every section, writing each file once")
+    parser.add_argument("--passes", default=",".join(DEFAULT_PASSES),
+                        help=f"Comma-separated passes to run (default: {','.join(DEFAULT_PASSES)})")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing any file")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument("--list", action="store_true", help="List the available passes")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, summary) in PASSES.items():
+            print(f"  {name:<18} {summary}")
+        return
+
+    try:
+        pass_names = parse_passes(args.passes)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or more")
+    jobs = args.jobs or os.cpu_count() or 1
+
+    print("=" * 60)
+    print(f"Section passes: {', '.join(pass_names)}{' (dry run)' if args.dry_run else ''}")
+    print("=" * 60)
+
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
+    results = process_all(repository, pass_names, args.dry_run, jobs)
+
+    report = {name: {} for name in pass_names}
+    written = 0
+    errors = 0
+    for result in results:
+        if result["error"]:
+            print(f"  ✗ {result['file']}: {result['error']}")
+            errors += 1
+            continue
+        for name, count in result["changes"].items():
+            report[name][result["file"]] = count
+        if result["written"]:
+            written += 1
+            changed = [name for name, count in result["changes"].items() if count]
+            print(f"  ✓ {result['file']}: {', '.join(changed)}")
+
+    print()
+    print_report(report, len(results))
+    print()
+    action = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ {action} {written} section files{f', {errors} could not be read' if errors else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,10 @@ This script specifically targets the B1-B2 (Phase 2) and C1 (Phase 3) sections
 with detailed grammar explanations and examples.
 """
 
-import json
 from pathlib import Path
 
+from content_repository import ContentRepository, section_id, section_number, write_if_changed
+
 SECTIONS_DIR = Path(__file__).parent.parent / "content" / "sections"
 
 # Complete grammar enhancements for sections 21-55
@@ -784,24 +785,22 @@ Dieser Abschnitt konzentriert sich auf C1-Sprachkenntnisse für die medizinische
 - 'Bei persistierenden Beschwerden bitten wir um Wiedervorstellung.'"""
         }
 
-def process_section(filepath):
+def process_section(filepath, repository):
     """Process a single section file."""
     filename = filepath.name
     
     # Extract section key
-    import re
-    match = re.search(r'(section_\d+)', filename)
-    if not match:
+    section_num = section_number(filename)
+    if section_num is None:
         return False
     
-    section_key = match.group(1)
+    section_key = f"section_{section_num:02d}"
     
     if section_key not in GRAMMAR_ENHANCEMENTS:
         return False
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = repository.section(section_id(filename))
     except:
         return False
     
@@ -811,11 +810,8 @@ def process_section(filepath):
     
     data["textContent"]["grammarFocus"] = GRAMMAR_ENHANCEMENTS[section_key]
     
-    # Save
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    
-    return True
+    # Save only if the grammar actually changed
+    return write_if_changed(filepath, data)
 
 def main():
     print("=" * 60)
@@ -823,11 +819,11 @@ def main():
     print("=" * 60)
     print()
     
-    section_files = sorted(SECTIONS_DIR.glob("section_*.json"))
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
     
     enhanced = 0
-    for filepath in section_files:
-        if process_section(filepath):
+    for filepath in repository.section_paths().values():
+        if process_section(filepath, repository):
             print(f"✓ Enhanced: {filepath.name}")
             enhanced += 1
     
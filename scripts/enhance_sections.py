@@ -10,10 +10,11 @@ This script:
 """
 
 import json
-imhttps://marketplace.cursorapi.com/downloads/production/extensions/f1f59ae4-9318-4f3c-a9b5-81b2eaa5f8a5/2025.6.1/darwin-arm64/Microsoft.VisualStudio.Services.Icons.Default?targetPlatform=darwin-arm64port os
-import re
+import os
 from pathlib import Path
 
+from content_repository import ContentRepository, section_id, section_number, write_if_changed
+
 SECTIONS_DIR = Path(__file__).parent.parent / "content" / "sections"
 ASSETS_AUDIO_DIR = Path(__file__).parent.parent / "assets" / "audio" / "sections"
 
@@ -138,13 +139,6 @@ Deutsch verwendet verschiedene Fälle, je nachdem ob man einen statischen Ort (D
     }
 }
 
-def get_section_number(filename):
-    """Extract section number from filename."""
-    match = re.search(r'section_(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
-
 def get_audio_pattern(section_num, dialogue_id, line_num):
     """Generate the audio URL pattern for a dialogue line."""
     section_str = f"{section_num:02d}" if section_num < 10 else str(section_num)
@@ -218,17 +212,16 @@ def add_dialogue_audio_urls(section_data, section_num):
     
     return modified
 
-def process_section_file(filepath):
+def process_section_file(filepath, repository):
     """Process a single section file."""
     filename = filepath.name
-    section_num = get_section_number(filename)
+    section_num = section_number(filename)
     section_key = f"section_{section_num:02d}" if section_num else None
     
     print(f"Processing: {filename}")
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            section_data = json.load(f)
+        section_data = repository.section(section_id(filename))
     except json.JSONDecodeError as e:
         print(f"  ERROR: Invalid JSON in {filename}: {e}")
         return False
@@ -253,9 +246,7 @@ def process_section_file(filepath):
             print(f"  ✓ Added missing audio URLs")
     
     # Save if modified
-    if modified:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(section_data, f, ensure_ascii=False, indent=4)
+    if modified and write_if_changed(filepath, section_data):
         print(f"  ✓ Saved changes")
     else:
         print(f"  - No changes needed")
@@ -273,7 +264,8 @@ def main():
         print(f"ERROR: Sections directory not found: {SECTIONS_DIR}")
         return
     
-    section_files = sorted(SECTIONS_DIR.glob("section_*.json"))
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
+    section_files = list(repository.section_paths().values())
     
     if not section_files:
         print("No section files found!")
@@ -286,7 +278,7 @@ def main():
     error_count = 0
     
     for filepath in section_files:
-        if process_section_file(filepath):
+        if process_section_file(filepath, repository):
             success_count += 1
         else:
             error_count += 1
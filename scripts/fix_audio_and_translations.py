@@ -6,9 +6,9 @@ This script:
 2. Adds translations for learningObjectives in all sections
 """
 
-import json
 import os
-import glob
+
+from content_repository import ContentRepository, section_id as file_section_id, write_if_changed
 
 SECTIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'content', 'sections')
 
@@ -93,10 +93,68 @@ def convert_learning_objectives_to_multilingual(objectives):
     return result
 
 
-def fix_section_file(filepath):
+def fix_learning_objectives(section):
+    """Convert a plain English learningObjectives list to multilingual format; return True if converted."""
+    text_content = section.get('textContent')
+    if not text_content:
+        return False
+    learning_objs = text_content.get('learningObjectives', [])
+    
+    # If it's a simple list, convert to multilingual
+    if isinstance(learning_objs, list) and learning_objs and isinstance(learning_objs[0], str):
+        text_content['learningObjectives'] = convert_learning_objectives_to_multilingual(learning_objs)
+        return True
+    return False
+
+
+def fill_grammar_languages(section):
+    """Use the English grammarFocus for languages that lack one; return the languages filled."""
+    text_content = section.get('textContent')
+    if not text_content:
+        return []
+    grammar = text_content.get('grammarFocus', {})
+    if not isinstance(grammar, dict) or 'en' not in grammar:
+        return []
+    missing_langs = [lang for lang in ['bn', 'hi', 'ur', 'tr'] if lang not in grammar or not grammar[lang]]
+    for lang in missing_langs:
+        grammar[lang] = grammar['en']
+    return missing_langs
+
+
+def fix_vocabulary_audio(section, section_id):
+    """Point every vocabulary audioUrl at its expected file; return the number of items fixed."""
+    fixed = 0
+    for i, vocab in enumerate(section.get('vocabulary', [])):
+        vocab_id = vocab.get('id', f'v{section_id.split("_")[1]}_{str(i+1).zfill(2)}')
+        expected_audio = f"assets/audio/sections/{section_id}/vocabulary/{vocab_id}.mp3"
+        
+        if vocab.get('audioUrl') != expected_audio:
+            vocab['audioUrl'] = expected_audio
+            vocab['id'] = vocab_id
+            fixed += 1
+    return fixed
+
+
+def fix_dialogue_audio(section, section_id):
+    """Give every dialogue an id and every line its expected audioUrl; return the number of values fixed."""
+    fixed = 0
+    for d_idx, dialogue in enumerate(section.get('dialogues', [])):
+        if 'id' not in dialogue:
+            dialogue['id'] = f'd{section_id.split("_")[1]}_{str(d_idx+1).zfill(2)}'
+            fixed += 1
+        dialogue_id = dialogue['id']
+        
+        for l_idx, line in enumerate(dialogue.get('lines', [])):
+            expected_audio = f"assets/audio/sections/{section_id}/dialogues/{dialogue_id}_line{l_idx+1}.mp3"
+            if line.get('audioUrl') != expected_audio:
+                line['audioUrl'] = expected_audio
+                fixed += 1
+    return fixed
+
+
+def fix_section_file(filepath, repository):
     """Fix a single section file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        section = json.load(f)
+    section = repository.section(file_section_id(os.path.basename(filepath)))
     
     section_id = section.get('id', os.path.basename(filepath).replace('.json', ''))
     print(f"Processing {section_id}...")
@@ -104,53 +162,22 @@ def fix_section_file(filepath):
     modified = False
     
     # Check and fix learningObjectives
-    if 'textContent' in section and section['textContent']:
-        learning_objs = section['textContent'].get('learningObjectives', [])
-        
-        # If it's a simple list, convert to multilingual
-        if isinstance(learning_objs, list) and learning_objs and isinstance(learning_objs[0], str):
-            section['textContent']['learningObjectives'] = convert_learning_objectives_to_multilingual(learning_objs)
-            modified = True
-            print(f"  ✓ Converted learningObjectives to multilingual format")
-        
-        # Check if grammarFocus has all languages
-        grammar = section['textContent'].get('grammarFocus', {})
-        if isinstance(grammar, dict):
-            missing_langs = [lang for lang in ['en', 'bn', 'hi', 'ur', 'tr'] if lang not in grammar or not grammar[lang]]
-            if missing_langs and 'en' in grammar:
-                # Use English as fallback for missing languages
-                for lang in missing_langs:
-                    if lang != 'en':
-                        section['textContent']['grammarFocus'][lang] = grammar['en']
-                        modified = True
-                        print(f"  ✓ Added {lang} fallback for grammarFocus")
+    if fix_learning_objectives(section):
+        modified = True
+        print(f"  ✓ Converted learningObjectives to multilingual format")
     
-    # Verify vocabulary audio URLs are correctly formatted
-    if 'vocabulary' in section:
-        for i, vocab in enumerate(section['vocabulary']):
-            vocab_id = vocab.get('id', f'v{section_id.split("_")[1]}_{str(i+1).zfill(2)}')
-            expected_audio = f"assets/audio/sections/{section_id}/vocabulary/{vocab_id}.mp3"
-            
-            if vocab.get('audioUrl') != expected_audio:
-                vocab['audioUrl'] = expected_audio
-                vocab['id'] = vocab_id
-                modified = True
+    # Check if grammarFocus has all languages
+    for lang in fill_grammar_languages(section):
+        modified = True
+        print(f"  ✓ Added {lang} fallback for grammarFocus")
     
-    # Verify dialogue audio URLs
-    if 'dialogues' in section:
-        for d_idx, dialogue in enumerate(section['dialogues']):
-            dialogue_id = dialogue.get('id', f'd{section_id.split("_")[1]}_{str(d_idx+1).zfill(2)}')
-            dialogue['id'] = dialogue_id
-            
-            for l_idx, line in enumerate(dialogue.get('lines', [])):
-                expected_audio = f"assets/audio/sections/{section_id}/dialogues/{dialogue_id}_line{l_idx+1}.mp3"
-                if line.get('audioUrl') != expected_audio:
-                    line['audioUrl'] = expected_audio
-                    modified = True
+    # Verify vocabulary and dialogue audio URLs are correctly formatted
+    if fix_vocabulary_audio(section, section_id):
+        modified = True
+    if fix_dialogue_audio(section, section_id):
+        modified = True
     
-    if modified:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(section, f, ensure_ascii=False, indent=4)
+    if modified and write_if_changed(filepath, section):
         print(f"  ✓ Saved changes to {filepath}")
     else:
         print(f"  - No changes needed")
@@ -162,12 +189,13 @@ def main():
     print("🔧 Fixing Audio Mapping and Translations\n")
     print("=" * 60)
     
-    section_files = sorted(glob.glob(os.path.join(SECTIONS_DIR, 'section_*.json')))
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
+    section_files = list(repository.section_paths().values())
     print(f"Found {len(section_files)} section files\n")
     
     modified_count = 0
     for filepath in section_files:
-        if fix_section_file(filepath):
+        if fix_section_file(filepath, repository):
             modified_count += 1
         print()
     
@@ -3,20 +3,21 @@
 Medical German Content Generator
 Generates expanded vocabulary, dialogues, and exercises for all 55 sections.
 Requirements: pip install google-generativeai
+
+Usage:
+    python generate_content.py --template                         # All 55 sections
+    python generate_content.py --template --sections 19-30,45     # Selected sections only
+    python generate_content.py --template --sections 30-55 --merge  # Only add missing keys
+Files are only rewritten when their content actually changes.
 """
 
-import json
+import argparse
+import importlib.util
 import os
-import sys
 from pathlib import Path
+from typing import Optional
 
-# Try to import Google Generative AI
-try:
-    import google.generativeai as genai
-    HAS_GENAI = True
-except ImportError:
-    HAS_GENAI = False
-    print("Note: google-generativeai not installed. Using template-based generation.")
+from content_repository import ContentRepository, write_if_changed
 
 CONTENT_DIR = Path(__file__).parent.parent / "content" / "sections"
 
@@ -248,19 +249,30 @@ def create_exercise_template(section_id: str, exercise_num: int, exercise_type:
     return base
 
 
-def generate_section_template(section_id: str, section_info: dict) -> dict:
-    """Generate a complete section template."""
+def generate_section_template(section_id: str, section_info: dict, parts: Optional[set] = None) -> dict:
+    """Generate a complete section template.
+
+    parts limits which of vocabulary, dialogues and exercises are built;
+    None builds all three.
+    """
     num = section_id[-2:]
     
     # Create 5 dialogues with ~5 lines each = 25 dialogue pairs
-    dialogues = [create_dialogue_template(section_id, i, 5) for i in range(1, 6)]
+    dialogues = []
+    if parts is None or "dialogues" in parts:
+        dialogues = [create_dialogue_template(section_id, i, 5) for i in range(1, 6)]
     
     # Create 18 exercises with mixed types
     exercises = []
-    types = ["multipleChoice", "fillBlank", "translation", "multipleChoice", "fillBlank", "multipleChoice"]
-    for i in range(1, 19):
-        ex_type = types[i % len(types)]
-        exercises.append(create_exercise_template(section_id, i, ex_type))
+    if parts is None or "exercises" in parts:
+        types = ["multipleChoice", "fillBlank", "translation", "multipleChoice", "fillBlank", "multipleChoice"]
+        for i in range(1, 19):
+            ex_type = types[i % len(types)]
+            exercises.append(create_exercise_template(section_id, i, ex_type))
+    
+    vocabulary = []
+    if parts is None or "vocabulary" in parts:
+        vocabulary = create_vocabulary_template(section_id, section_info, 30)
     
     return {
         "id": section_id,
@@ -320,7 +332,7 @@ def generate_section_template(section_id: str, section_info: dict) -> dict:
                 "Build confidence in medical German communication"
             ]
         },
-        "vocabulary": create_vocabulary_template(section_id, section_info, 30),
+        "vocabulary": vocabulary,
         "dialogues": dialogues,
         "exercises": exercises,
         "media": {
@@ -331,41 +343,107 @@ def generate_section_template(section_id: str, section_info: dict) -> dict:
     }
 
 
+def _is_missing(value) -> bool:
+    return value is None or value == [] or value == {}
+
+
+def merge_missing(existing, template):
+    """Fill keys missing (or empty) in existing from template, keeping everything already there."""
+    if not isinstance(existing, dict) or not isinstance(template, dict):
+        return existing
+    merged = dict(existing)
+    for key, value in template.items():
+        if key not in merged or _is_missing(merged[key]):
+            merged[key] = value
+        else:
+            merged[key] = merge_missing(merged[key], value)
+    return merged
+
+
+def parse_section_selector(selector: str) -> list:
+    """Turn '19-30,45' into ['section_19', ..., 'section_30', 'section_45']."""
+    numbers = set()
+    for part in selector.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(n) for n in part.split('-', 1))
+            if start > end:
+                raise ValueError(f"Reversed range: {part} (did you mean {end}-{start}?)")
+            numbers.update(range(start, end + 1))
+        else:
+            numbers.add(int(part))
+    unknown = sorted(n for n in numbers if f"section_{n:02d}" not in SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(str(n) for n in unknown)}")
+    return [f"section_{n:02d}" for n in sorted(numbers)]
+
+
+def section_path(repository: ContentRepository, section_id: str) -> Path:
+    """Existing file of a section (named files like section_01_greetings.json included), or the default name."""
+    return repository.path(section_id) or CONTENT_DIR / f"{section_id}.json"
+
+
+def has_genai() -> bool:
+    """Check for google-generativeai without importing it; templates never need it."""
+    try:
+        return importlib.util.find_spec("google.generativeai") is not None
+    except ModuleNotFoundError:
+        return False
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate section template files")
+    parser.add_argument("--template", action="store_true", help="Generate template JSON files")
+    parser.add_argument("--sections", help="Sections to generate, e.g. '19-30' or '1,5,40-42' (default: all)")
+    parser.add_argument("--merge", action="store_true",
+                        help="Only fill keys missing from existing files instead of replacing them")
+    args = parser.parse_args()
+    
     print("Medical German Content Generator")
     print("=" * 50)
+    if not has_genai():
+        print("Note: google-generativeai not installed. Using template-based generation.")
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--template":
+    if args.template:
+        try:
+            section_ids = parse_section_selector(args.sections) if args.sections else list(SECTIONS)
+        except ValueError as e:
+            parser.error(str(e))
+        
         # Generate template files
-        print("\nGenerating template files for all 55 sections...")
+        mode = "Merging missing keys into" if args.merge else "Generating template files for"
+        print(f"\n{mode} {len(section_ids)} sections...")
         
-        for section_id, section_info in SECTIONS.items():
-            template = generate_section_template(section_id, section_info)
+        repository = ContentRepository(sections_dir=CONTENT_DIR)
+        written = 0
+        for section_id in section_ids:
+            section_info = SECTIONS[section_id]
+            filepath = section_path(repository, section_id)
             
-            # Determine filename
-            num = section_id[-2:]
-            if int(num) <= 18:
-                # These have named files
-                files = list(CONTENT_DIR.glob(f"section_{num}_*.json"))
-                if files:
-                    filepath = files[0]
-                else:
-                    filepath = CONTENT_DIR / f"{section_id}.json"
+            if args.merge and filepath.exists():
+                existing = repository.section(section_id)
+                # Only build the large lists the file does not have yet
+                parts = {key for key in ("vocabulary", "dialogues", "exercises") if _is_missing(existing.get(key))}
+                section = merge_missing(existing, generate_section_template(section_id, section_info, parts))
             else:
-                filepath = CONTENT_DIR / f"{section_id}.json"
+                section = generate_section_template(section_id, section_info)
             
-            # Write template
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(template, f, ensure_ascii=False, indent=4)
-            
-            print(f"✓ Generated template: {filepath.name}")
+            if write_if_changed(filepath, section):
+                written += 1
+                print(f"✓ Generated template: {filepath.name}")
+            else:
+                print(f"= Unchanged: {filepath.name}")
         
         print("\n" + "=" * 50)
-        print("Templates generated! Replace [PLACEHOLDER] values with actual content.")
+        print(f"Templates generated! {written} written, {len(section_ids) - written} unchanged.")
+        print("Replace [PLACEHOLDER] values with actual content.")
         
     else:
         print("\nUsage:")
         print("  python generate_content.py --template    Generate template JSON files")
+        print("  python generate_content.py --template --sections 19-30 --merge")
         print("\nNote: Templates contain placeholder values that need to be filled with actual medical German content.")
 
 
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+JSON codec for the content files.
+Uses orjson when it is installed and the standard library otherwise. Both
+write exactly what json.dump(..., ensure_ascii=False, indent=4) writes, so
+switching codecs never shows up in a diff: orjson's two-space indentation is
+widened to four, and documents orjson would format differently (floats in
+exponent notation, integers over 64 bits, non-string keys) go through the
+standard library. The one exception is NaN and Infinity, which are not JSON
+and never occur in the content: orjson writes them as null. Set
+MEDDEUTSCH_JSON_CODEC=json to force the standard library.
+
+Usage:
+    from json_codec import load, dumps
+    section = load(path)
+    content = dumps(section)                    # UTF-8 bytes
+
+    python json_codec.py                        # Benchmark both codecs on content/
+    python json_codec.py --repeat 10 --codec orjson
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+CONTENT_ROOT = Path(__file__).parent.parent / "content"
+CODEC_ENV = "MEDDEUTSCH_JSON_CODEC"
+
+# orjson and the standard library agree on floats in [1e-4, 1e16) only; outside
+# that range orjson writes 1e16 / 1e-7 / 0.00001 where json writes 1e+16 / 1e-07 / 1e-05.
+# Only number tokens can end a line without a closing quote.
+EXPONENT_RE = re.compile(rb'e-?[0-9]+,?\n')
+SMALL_FLOAT_RE = re.compile(rb'\.0000[0-9]*,?\n')
+# Strings never contain a raw newline, so spaces right after one are always indentation
+INDENT_RE = re.compile(rb'\n((?:  )+)')
+
+
+def widen_indent(content: bytes) -> bytes:
+    """Turn two-space indentation into four-space indentation."""
+    parts = INDENT_RE.split(content)
+    parts[1::2] = [b'\n' + indent + indent for indent in parts[1::2]]
+    return b''.join(parts)
+
+
+class StdlibCodec:
+    """json from the standard library; the reference output."""
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(value, ensure_ascii=False, indent=4).encode('utf-8')
+
+
+class OrjsonCodec(StdlibCodec):
+    """orjson, falling back to the standard library wherever their output would differ."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def loads(self, data):
+        try:
+            return self.orjson.loads(data)
+        except self.orjson.JSONDecodeError:
+            # NaN literals, lone surrogates, ...: accept or reject them exactly like json does
+            return super().loads(data)
+
+    def dumps(self, value) -> bytes:
+        if not isinstance(value, (dict, list)):
+            # Bare scalars are not worth it and do not end in a newline-terminated token
+            return super().dumps(value)
+        try:
+            content = self.orjson.dumps(value, option=self.orjson.OPT_INDENT_2)
+        except TypeError:
+            # Integers over 64 bits, non-string keys, lone surrogates, other types
+            return super().dumps(value)
+        if EXPONENT_RE.search(content) or SMALL_FLOAT_RE.search(content):
+            return super().dumps(value)
+        return widen_indent(content)
+
+
+CODECS = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+}
+
+
+def create_codec(name: str = None) -> StdlibCodec:
+    """Codec by name; by default the one named in MEDDEUTSCH_JSON_CODEC, else orjson if installed."""
+    name = name or os.environ.get(CODEC_ENV)
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"Unknown JSON codec: {name} (available: {', '.join(CODECS)})")
+        return CODECS[name]()
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibCodec()
+
+
+# Codec used by loads()/dumps()/load(), created on first use
+codec = None
+
+
+def get_codec() -> StdlibCodec:
+    global codec
+    if codec is None:
+        codec = create_codec()
+    return codec
+
+
+def loads(data):
+    return get_codec().loads(data)
+
+
+def dumps(value) -> bytes:
+    """value as UTF-8 bytes, identical to json.dumps(value, ensure_ascii=False, indent=4)."""
+    return get_codec().dumps(value)
+
+
+def load(path: Path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def benchmark(codec: StdlibCodec, files: dict, repeat: int) -> tuple:
+    """Best (load seconds, dump seconds) over repeat rounds of loading and dumping every file."""
+    values = {path: codec.loads(raw) for path, raw in files.items()}
+    best_load = best_dump = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in files.values():
+            codec.loads(raw)
+        best_load = min(best_load, time.perf_counter() - start)
+        start = time.perf_counter()
+        for value in values.values():
+            codec.dumps(value)
+        best_dump = min(best_dump, time.perf_counter() - start)
+    return best_load, best_dump
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codecs on the content corpus")
+    parser.add_argument("--content-dir", type=Path, default=CONTENT_ROOT, help="Directory to read *.json from")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per codec; the best round is reported")
+    parser.add_argument("--codec", action="append", choices=list(CODECS),
+                        help="Codec to benchmark (repeatable, default: all installed)")
+    args = parser.parse_args()
+
+    files = {path: path.read_bytes() for path in sorted(args.content_dir.rglob("*.json"))}
+    if not files:
+        print(f"No JSON files under {args.content_dir}")
+        return
+    megabytes = sum(len(raw) for raw in files.values()) / (1024 * 1024)
+    print(f"Corpus: {len(files)} files, {megabytes:.1f} MB, best of {args.repeat} rounds\n")
+
+    reference = StdlibCodec()
+    expected = {path: reference.dumps(reference.loads(raw)) for path, raw in files.items()}
+
+    print(f"{'Codec':<8} {'Load MB/s':>10} {'Dump MB/s':>10} {'Load ms':>9} {'Dump ms':>9}  Output")
+    for name in args.codec or list(CODECS):
+        try:
+            codec = CODECS[name]()
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        mismatches = [path.name for path, raw in files.items() if codec.dumps(codec.loads(raw)) != expected[path]]
+        load_s, dump_s = benchmark(codec, files, args.repeat)
+        identical = "✓ identical" if not mismatches else f"✗ differs in {', '.join(mismatches[:3])}"
+        print(f"{name:<8} {megabytes / load_s:>10.1f} {megabytes / dump_s:>10.1f} "
+              f"{load_s * 1000:>9.1f} {dump_s * 1000:>9.1f}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+meddeutsch-content: one entry point for the content scripts.
+Each subcommand imports its script only when it runs, so --help and
+validate start without loading google-generativeai, deep-translator or
+the large topic tables of the other scripts.
+
+Usage:
+    python meddeutsch_content.py --help
+    python meddeutsch_content.py template
+    python meddeutsch_content.py populate --section 19 --provider synthetic
+    python meddeutsch_content.py translate --plan
+    python meddeutsch_content.py validate
+    python meddeutsch_content.py --check-startup
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# name -> (module, summary, arguments the script always gets, module parses its own arguments)
+SUBCOMMANDS = {
+    "template": ("generate_content", "Write section template files", ["--template"], True),
+    "populate": ("ai_populate", "Generate section content with a model provider", [], True),
+    "translate": ("translate_all_content", "Translate English content into all app languages", [], True),
+    "enhance": ("enhance_passes", "Run the grammar, audio URL and objective passes over all sections", [], True),
+    "audio-urls": ("add_audio_urls", "Add audio URLs to dialogue lines", [], False),
+    "validate": ("validate_content", "Check sections, phases and mock tests for consistency", [], True),
+}
+
+# Modules that must not be loaded just to parse the command line
+HEAVY_MODULES = ["google.generativeai", "deep_translator", "requests", "orjson"] + [
+    module for module, _, _, _ in SUBCOMMANDS.values()
+]
+STARTUP_BUDGET_MS = 20.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="meddeutsch-content",
+        description="MedDeutsch content tools",
+        epilog="Run '<subcommand> --help' for the options of each subcommand.",
+    )
+    parser.add_argument("--check-startup", action="store_true",
+                        help="Fail if parsing --help imports heavy modules or exceeds the import budget")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Import-time budget for --check-startup in milliseconds")
+    subparsers = parser.add_subparsers(dest="command", metavar="subcommand")
+    for name, (_, summary, _, parses_args) in SUBCOMMANDS.items():
+        # Scripts with their own parser receive the remaining arguments, --help included
+        subparsers.add_parser(name, help=summary, description=summary, add_help=not parses_args)
+    return parser
+
+
+def import_times(args: list) -> tuple:
+    """Run python -X importtime with args; return (top-level module -> cumulative us, all loaded modules, exit code)."""
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True)
+    top_level = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        loaded.add(name.strip())
+        if not name.startswith("  "):
+            # Top-level entries already include their nested imports
+            top_level[name.strip()] = int(fields[1])
+    return top_level, loaded, result.returncode
+
+
+def check_startup(budget_ms: float) -> bool:
+    """Run '--help' under -X importtime and check the import cost and which modules got loaded.
+
+    Imports that a bare interpreter performs anyway (site, encodings, ...)
+    are not counted against the budget.
+    """
+    baseline, _, _ = import_times(["-c", "pass"])
+    top_level, loaded, returncode = import_times([str(Path(__file__).resolve()), "--help"])
+    total_ms = sum(us for name, us in top_level.items() if name not in baseline) / 1000
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    ok = returncode == 0 and not heavy and total_ms <= budget_ms
+    print(f"{'✓' if total_ms <= budget_ms else '✗'} Imports for --help: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if heavy:
+        print(f"✗ Heavy modules loaded at startup: {', '.join(heavy)}")
+    if returncode != 0:
+        print(f"✗ --help exited with status {returncode}")
+    return ok
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+
+    if args.check_startup:
+        sys.exit(0 if check_startup(args.budget_ms) else 1)
+    if args.command is None:
+        parser.print_help()
+        return
+
+    module_name, _, fixed_args, parses_args = SUBCOMMANDS[args.command]
+    if rest and not parses_args:
+        parser.error(f"{args.command} takes no arguments: {' '.join(rest)}")
+
+    module = importlib.import_module(module_name)
+
+    # The scripts read sys.argv themselves
+    sys.argv = [f"meddeutsch-content {args.command}"] + fixed_args + rest
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the translation service.
+Speaks the LibreTranslate-style API used by translate_all_content.py --backend http,
+with configurable latency, error and throttling rates, so the translation
+pipeline can be tested and benchmarked offline.
+
+Usage:
+    python mock_translate_server.py --port 5055 --latency 0.3 --error-rate 0.05
+    python translate_all_content.py --backend http --backend-url http://127.0.0.1:5055
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_REQUEST_CHARS = 5000
+
+# Lines the mock must leave untouched so batched requests split back cleanly
+PASSTHROUGH_LINE_RE = re.compile(r'^\s*(\[\[\s*##\s*\]\])?\s*$')
+
+
+def fake_translate(text, target_lang):
+    """Deterministic pseudo-translation: tag every non-empty line with the target language."""
+    lines = []
+    for line in text.split('\n'):
+        if PASSTHROUGH_LINE_RE.match(line):
+            lines.append(line)
+        else:
+            lines.append(f"[{target_lang}] {line}")
+    return '\n'.join(lines)
+
+
+class MockTranslateHandler(BaseHTTPRequestHandler):
+    """Handles POST /translate with keep-alive connections."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.server.snapshot())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        if self.path != '/translate':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        try:
+            payload = json.loads(raw.decode('utf-8'))
+            text = payload['q']
+            target = payload['target']
+        except (ValueError, KeyError):
+            self._send_json(400, {'error': 'Expected JSON with q and target'})
+            return
+
+        server = self.server
+        server.record('requests')
+        server.record('chars', len(text))
+
+        delay = max(0.0, random.gauss(server.latency, server.jitter)) if server.jitter else server.latency
+        time.sleep(delay)
+
+        roll = random.random()
+        if roll < server.throttle_rate:
+            server.record('throttled')
+            self._send_json(429, {'error': 'Too many requests'})
+        elif roll < server.throttle_rate + server.error_rate:
+            server.record('errors')
+            self._send_json(500, {'error': 'Simulated server error'})
+        elif len(text) > MAX_REQUEST_CHARS:
+            server.record('errors')
+            self._send_json(413, {'error': f'Text exceeds {MAX_REQUEST_CHARS} characters'})
+        else:
+            self._send_json(200, {'translatedText': fake_translate(text, target)})
+
+
+class MockTranslateServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the simulation settings and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.2, jitter=0.0, error_rate=0.0, throttle_rate=0.0, verbose=False):
+        super().__init__(address, MockTranslateHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.verbose = verbose
+        self.stats = {'requests': 0, 'chars': 0, 'errors': 0, 'throttled': 0}
+        self.stats_lock = threading.Lock()
+
+    def record(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def snapshot(self):
+        with self.stats_lock:
+            return dict(self.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the translation service")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=5055, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = MockTranslateServer(
+        (args.host, args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        verbose=args.verbose,
+    )
+    print(f"Mock translation server on http://{args.host}:{args.port}")
+    print(f"Latency {args.latency}s ± {args.jitter}s, errors {args.error_rate:.0%}, throttled {args.throttle_rate:.0%}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nServed: {server.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,66 @@
 #!/usr/bin/env python3
 """
-Translate Learning Objectives and Grammar Focus into all supported languages
-Uses deep-translator (Google Translate free tier)
+Translate section text content, vocabulary, dialogues and exercise explanations
+into all supported languages.
+Uses deep-translator (Google Translate free tier) by default, or any
+LibreTranslate-compatible HTTP service via --backend http (see
+mock_translate_server.py for an offline stand-in).
+
+Only English sources that changed since the last run (tracked per field in
+content/translation_manifest.json) and are missing from the local translation
+memory are sent. Requests are batched, rate limited and retried; finished
+segments are journaled so an interrupted run can be continued with --resume.
+Use --plan to estimate requests and time without any network calls.
 """
 
+import argparse
+import hashlib
 import json
 import os
-import glob
+import re
+import sqlite3
+import threading
 import time
-from deep_translator import GoogleTranslator
+from concurrent.futures import ThreadPoolExecutor
+
+from content_repository import ContentRepository, section_id as file_section_id, write_if_changed
 
 SECTIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'content', 'sections')
+TRANSLATION_MEMORY_PATH = os.path.join(os.path.dirname(__file__), '.translation_memory.sqlite3')
+TRANSLATION_JOURNAL_PATH = os.path.join(os.path.dirname(__file__), '.translation_journal.jsonl')
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), '..', 'content', 'translation_manifest.json')
+
+DEFAULT_BACKEND = 'google'
+DEFAULT_BACKEND_URL = 'http://127.0.0.1:5055'
+DEFAULT_WORKERS = 8
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+# Adaptive concurrency (AIMD): start low, +1 per window of successes, halve on throttling
+DEFAULT_INITIAL_CONCURRENCY = 2
+AIMD_DECREASE_FACTOR = 0.5
+THROTTLE_COOLDOWN = 2.0       # seconds all workers pause after a 429 or timeout
+LATENCY_TOLERANCE = 2.0       # hold growth while latency exceeds this multiple of the best seen
+DEFAULT_RETRY_ROUNDS = 2
+RETRY_ROUND_DELAY = 5.0
+
+# Assumed round-trip time per request for --plan projections
+DEFAULT_PLAN_LATENCY = 0.5
+
+# Batched requests: short segments joined by a delimiter the translator leaves alone
+BATCH_DELIMITER = '\n[[##]]\n'
+BATCH_SPLIT_RE = re.compile(r'\s*\[\[\s*##\s*\]\]\s*')
+BATCH_MAX_CHARS = 4500
+BATCH_MAX_SEGMENTS = 40
+BATCH_SEGMENT_MAX_CHARS = 500
+
+# Long texts: Google Translate rejects requests over ~5000 characters
+CHUNK_MAX_CHARS = 4500
+CHUNK_SPLIT_PATTERNS = [
+    r'\n[ \t]*\n\s*',          # paragraphs
+    r'\n',                       # lines and bullets
+    r'(?<=[.!?:;])[ \t]+(?=\S)',  # sentences
+    r'[ \t]+',                   # words
+]
 
 # Language codes
 LANGUAGES = {
@@ -21,142 +71,1043 @@ LANGUAGES = {
 }
 
 
+class TranslationMemory:
+    """On-disk cache of finished translations keyed by source text and language pair."""
+
+    def __init__(self, path=TRANSLATION_MEMORY_PATH):
+        self.path = path
+        # Shared by all worker threads; every access goes through self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            ' key TEXT PRIMARY KEY,'
+            ' source_lang TEXT NOT NULL,'
+            ' target_lang TEXT NOT NULL,'
+            ' source_text TEXT NOT NULL,'
+            ' translated_text TEXT NOT NULL)'
+        )
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, source_lang, target_lang):
+        """Hash the source text together with the language pair."""
+        raw = f"{source_lang}\0{target_lang}\0{text}".encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, text, source_lang, target_lang):
+        """Return the stored translation, or None if the text was never translated."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT translated_text FROM translations WHERE key = ?',
+                (self.make_key(text, source_lang, target_lang),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, source_lang, target_lang, translated):
+        """Store a successful translation."""
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)',
+                (self.make_key(text, source_lang, target_lang), source_lang, target_lang, text, translated)
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def source_hash(text):
+    """Short content hash used to check that a stored result still matches its source."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class TranslationJournal:
+    """Append-only JSON-lines log of finished (section, field, index, language) translations.
+
+    With resume=True the existing journal is replayed first; entries whose
+    English source has changed since they were written are ignored.
+    """
+
+    def __init__(self, path=TRANSLATION_JOURNAL_PATH, resume=False):
+        self.path = path
+        self.entries = {}
+        self.replayed = 0
+        self.lock = threading.Lock()
+        needs_newline = False
+        if resume and os.path.exists(path):
+            needs_newline = self._replay()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if needs_newline:
+            self.file.write('\n')
+
+    def _replay(self):
+        """Load entries from disk; return True if the last line was cut off mid-write."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn line from a crash
+            key = (entry['section'], entry['field'], entry['index'], entry['lang'])
+            self.entries[key] = (entry['source'], entry['text'])
+        return bool(content) and not content.endswith('\n')
+
+    def get(self, section_id, field, index, lang, source_text):
+        """Return the journaled translation, or None if it is missing or stale."""
+        entry = self.entries.get((section_id, field, index, lang))
+        if entry is None or entry[0] != source_hash(source_text):
+            return None
+        with self.lock:
+            self.replayed += 1
+        return entry[1]
+
+    def record(self, section_id, field, index, lang, source_text, translated):
+        """Append one finished translation and flush it to disk."""
+        entry = {
+            'section': section_id,
+            'field': field,
+            'index': index,
+            'lang': lang,
+            'source': source_hash(source_text),
+            'text': translated,
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.entries[(section_id, field, index, lang)] = (entry['source'], translated)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class TranslationManifest:
+    """Hashes of the English source of every translated field, per section.
+
+    Stored as {section_id: {field_path: source_hash}} next to the sections.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.sections = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.sections = json.load(f)
+
+    def get(self, section_id, field_path):
+        return self.sections.get(section_id, {}).get(field_path)
+
+    def update_section(self, section_id, hashes):
+        """Replace the section's entries, dropping fields that no longer exist."""
+        self.sections[section_id] = hashes
+
+    def save(self):
+        """Write the manifest atomically, and only if it changed."""
+        return write_if_changed(self.path, self.sections)
+
+
+class TokenBucket:
+    """Thread-safe requests-per-second limiter shared by all translation workers."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationThrottled(Exception):
+    """The service asked us to slow down (HTTP 429/503) or timed out."""
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight translation requests, shared by every worker.
+
+    Each success grows the limit by 1/limit (about +1 per window of requests)
+    unless latency has degraded; each throttle halves it and pauses all
+    workers for THROTTLE_COOLDOWN seconds.
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL_CONCURRENCY, maximum=DEFAULT_WORKERS, minimum=1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.best_latency = None
+        self.peak = self.limit
+        self.successes = 0
+        self.throttles = 0
+        self.errors = 0
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        """Block until a request slot is free and no throttle pause is active."""
+        with self.cond:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    self.cond.wait(pause)
+                elif self.in_flight >= int(self.limit):
+                    self.cond.wait()
+                else:
+                    self.in_flight += 1
+                    return
+
+    def release(self, outcome, latency=None):
+        """Return a slot and adjust the limit; outcome is 'ok', 'throttled' or 'error'."""
+        with self.cond:
+            self.in_flight -= 1
+            if outcome == 'ok':
+                self.successes += 1
+                if self.best_latency is None or latency < self.best_latency:
+                    self.best_latency = latency
+                if latency <= self.best_latency * LATENCY_TOLERANCE:
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                    self.peak = max(self.peak, self.limit)
+            elif outcome == 'throttled':
+                self.throttles += 1
+                now = time.monotonic()
+                # One cut per cooldown window, however many requests were throttled together
+                if now >= self.paused_until:
+                    self.limit = max(self.minimum, self.limit * AIMD_DECREASE_FACTOR)
+                    self.paused_until = now + THROTTLE_COOLDOWN
+            else:
+                self.errors += 1
+            self.cond.notify_all()
+
+
+class TranslationBackend:
+    """Interface for the service that performs the actual translation requests."""
+
+    name = 'base'
+
+    def translate(self, text, target_lang):
+        """Translate one request's worth of English text.
+
+        Raise TranslationThrottled when the service rate-limits or times out,
+        any other exception for other failures.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate via deep-translator.
+
+    GoogleTranslator.translate mutates its own request parameters, so one
+    translator is kept per worker thread and target language instead of
+    building a new one for every attempt. deep-translator opens its own HTTP
+    connections, so sockets are not pooled here.
+    """
+
+    name = 'google'
+
+    def __init__(self, source_lang='en'):
+        import requests
+        from deep_translator import GoogleTranslator
+        from deep_translator.exceptions import TooManyRequests
+        self.translator_class = GoogleTranslator
+        self.throttle_errors = (TooManyRequests, requests.Timeout)
+        self.source_lang = source_lang
+        self.local = threading.local()
+
+    def translate(self, text, target_lang):
+        translators = getattr(self.local, 'translators', None)
+        if translators is None:
+            translators = self.local.translators = {}
+        if target_lang not in translators:
+            translators[target_lang] = self.translator_class(source=self.source_lang, target=target_lang)
+        try:
+            return translators[target_lang].translate(text)
+        except self.throttle_errors as e:
+            raise TranslationThrottled(str(e)) from e
+
+
+class HttpBackend(TranslationBackend):
+    """LibreTranslate-compatible HTTP API with a keep-alive session per target language.
+
+    POST {url}/translate with {"q", "source", "target", "format"} and read
+    "translatedText" from the JSON response.
+    """
+
+    name = 'http'
+
+    def __init__(self, url=DEFAULT_BACKEND_URL, source_lang='en', pool_size=DEFAULT_WORKERS, timeout=30):
+        import requests
+        self.requests = requests
+        self.url = url.rstrip('/') + '/translate'
+        self.source_lang = source_lang
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def _session(self, target_lang):
+        with self.lock:
+            session = self.sessions.get(target_lang)
+            if session is None:
+                session = self.requests.Session()
+                adapter = self.requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[target_lang] = session
+            return session
+
+    def translate(self, text, target_lang):
+        try:
+            response = self._session(target_lang).post(
+                self.url,
+                json={'q': text, 'source': self.source_lang, 'target': target_lang, 'format': 'text'},
+                timeout=self.timeout,
+            )
+        except self.requests.Timeout as e:
+            raise TranslationThrottled(f"Timed out after {self.timeout}s") from e
+        if response.status_code in (429, 503):
+            raise TranslationThrottled(f"HTTP {response.status_code}")
+        response.raise_for_status()
+        return response.json()['translatedText']
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    HttpBackend.name: HttpBackend,
+}
+
+
+def create_backend(name, url=DEFAULT_BACKEND_URL, pool_size=DEFAULT_WORKERS):
+    """Build the translation backend selected on the command line."""
+    if name == HttpBackend.name:
+        return HttpBackend(url, pool_size=pool_size)
+    return BACKENDS[name]()
+
+
+# Shared translation backend, created in main() or on first use
+backend = None
+
+# Shared translation memory, opened in main() unless --no-cache is given
+translation_memory = None
+
+# Checkpoint journal, opened in main()
+journal = None
+
+# Source hash manifest, loaded in main()
+manifest = None
+
+# Shared worker pool, rate limiter and concurrency controller, created in main()
+executor = None
+rate_limiter = None
+concurrency = None
+
+# Separate pool for the chunks of long texts, so workers waiting on their
+# chunks can never starve the main pool
+chunk_executor = None
+
+# Pack short segments into multi-segment requests (disabled by --no-batch)
+batch_mode = True
+
+# Extra passes over the retry queue after the main pass
+retry_rounds = DEFAULT_RETRY_ROUNDS
+
+# Retry queue: (text, target_lang) pairs whose translation failed in this run.
+# Their English fallback is never written into the section.
+failed_translations = set()
+failed_lock = threading.Lock()
+
+
 def translate_text(text, target_lang, max_retries=3):
-    """Translate text to target language with retry logic."""
+    """Translate text to target language with retry logic.
+
+    The translation memory is consulted before any network call and filled
+    after each success. Failed translations fall back to the English original
+    and are never cached.
+    """
     if not text or text.strip() == '':
         return ''
     
+    if translation_memory is not None:
+        cached = translation_memory.get(text, 'en', target_lang)
+        if cached is not None:
+            return cached
+    
+    translated = _translate_uncached(text, target_lang, max_retries)
+    if translated is None:
+        with failed_lock:
+            failed_translations.add((text, target_lang))
+        return text  # Return original on error
+    
+    if translation_memory is not None:
+        translation_memory.put(text, 'en', target_lang, translated)
+    return translated
+
+
+def _translate_uncached(text, target_lang, max_retries=3):
+    """Call Google Translate, returning None when every attempt failed."""
+    if len(text) > CHUNK_MAX_CHARS:
+        return _translate_chunked(text, target_lang, max_retries)
+    return _translate_request(text, target_lang, max_retries)
+
+
+def _translate_request(text, target_lang, max_retries=3):
+    """Send one request of at most CHUNK_MAX_CHARS characters."""
+    global backend
+    if backend is None:
+        backend = create_backend(DEFAULT_BACKEND)
+    
+    error = None
     for attempt in range(max_retries):
+        if concurrency is not None:
+            concurrency.acquire()
+        outcome = 'error'
+        start = time.monotonic()
         try:
-            translator = GoogleTranslator(source='en', target=target_lang)
-            # Split long text into chunks if needed (Google Translate limit)
-            if len(text) > 4500:
-                chunks = [text[i:i+4500] for i in range(0, len(text), 4500)]
-                translated_chunks = []
-                for chunk in chunks:
-                    translated_chunks.append(translator.translate(chunk))
-                    time.sleep(0.5)
-                return ''.join(translated_chunks)
-            else:
-                result = translator.translate(text)
-                return result if result else text
+            _wait_for_rate_limit()
+            result = backend.translate(text, target_lang)
+            outcome = 'ok'
+            return result if result else None
+        except TranslationThrottled as e:
+            outcome = 'throttled'
+            error = e
         except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
+            error = e
+        finally:
+            if concurrency is not None:
+                concurrency.release(outcome, time.monotonic() - start)
+    print(f"    ✗ Translation error for {target_lang}, queued for retry: {str(error)[:50]}")
+    return None
+
+
+def _translate_chunked(text, target_lang, max_retries=3):
+    """Translate a long text chunk by chunk, concurrently, and reassemble it in order."""
+    chunks = chunk_markdown(text)
+    
+    def run(chunk):
+        body, _ = chunk
+        if body.strip() == '':
+            return body
+        return _translate_request(body, target_lang, max_retries)
+    
+    if chunk_executor is None:
+        translated = [run(chunk) for chunk in chunks]
+    else:
+        translated = list(chunk_executor.map(run, chunks))
+    
+    if any(part is None for part in translated):
+        return None
+    return ''.join(part + sep for part, (_, sep) in zip(translated, chunks))
+
+
+def _is_open_markdown(text):
+    """Return True if text ends inside a **bold**, *italic* or `code` span."""
+    if text.count('**') % 2:
+        return True
+    rest = re.sub(r'(?m)^[ \t]*\*[ \t]', '', text.replace('**', ''))  # bullets are not spans
+    return rest.count('*') % 2 == 1 or rest.count('`') % 2 == 1
+
+
+def _split_units(text, pattern):
+    """Split text into (unit, separator) pairs, re-joining units that would break a markdown span."""
+    parts = re.split(f'({pattern})', text)
+    units = [(parts[i], parts[i + 1] if i + 1 < len(parts) else '') for i in range(0, len(parts), 2)]
+    
+    merged = []
+    for unit, sep in units:
+        if merged and _is_open_markdown(merged[-1][0]):
+            prev_unit, prev_sep = merged[-1]
+            merged[-1] = (prev_unit + prev_sep + unit, sep)
+        else:
+            merged.append((unit, sep))
+    return merged
+
+
+def chunk_markdown(text, limit=CHUNK_MAX_CHARS, level=0):
+    """Split text into (chunk, separator) pairs of at most limit characters.
+
+    Splits on paragraph boundaries first, then lines, sentences and words, and
+    never inside a markdown span. ''.join(chunk + sep) reproduces text exactly.
+    """
+    if len(text) <= limit:
+        return [(text, '')]
+    if level >= len(CHUNK_SPLIT_PATTERNS):
+        # A single unbreakable run; slicing is the only option left
+        return [(text[i:i + limit], '') for i in range(0, len(text), limit)]
+    
+    chunks = []
+    current = None
+    current_sep = ''
+    for unit, sep in _split_units(text, CHUNK_SPLIT_PATTERNS[level]):
+        if len(unit) > limit:
+            if current is not None:
+                chunks.append((current, current_sep))
+                current = None
+            sub_chunks = chunk_markdown(unit, limit, level + 1)
+            last_chunk, last_sep = sub_chunks[-1]
+            sub_chunks[-1] = (last_chunk, last_sep + sep)
+            chunks.extend(sub_chunks)
+            continue
+        if current is None:
+            current = unit
+        elif len(current) + len(current_sep) + len(unit) > limit:
+            chunks.append((current, current_sep))
+            current = unit
+        else:
+            current = current + current_sep + unit
+        current_sep = sep
+    if current is not None:
+        chunks.append((current, current_sep))
+    return chunks
+
+
+def _wait_for_rate_limit():
+    """Take a token from the shared rate limiter before a network call."""
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+
+def _run_parallel(func, items):
+    """Map func over items on the shared worker pool, preserving order."""
+    if executor is None:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+def translate_parallel(jobs, on_result=None):
+    """Translate (text, target_lang) pairs on the shared worker pool.
+
+    Results are returned in the same order as jobs. on_result(position,
+    translated) is called from the worker as soon as each job finishes.
+    """
+    if batch_mode:
+        return _translate_parallel_batched(jobs, on_result)
+    
+    def run(position):
+        translated = translate_text(*jobs[position])
+        if on_result is not None:
+            on_result(position, translated)
+        return translated
+    
+    return _run_parallel(run, range(len(jobs)))
+
+
+def translate_deduplicated(job_lists):
+    """Translate per-section job lists, sending each unique (text, target_lang) pair once.
+
+    job_lists maps section_id to a list of (field, index, text, target_lang)
+    jobs. Results already in the checkpoint journal are replayed without a
+    network call. Every other occurrence of a pair is filled from the one
+    translation of that pair and journaled as soon as it arrives. Returns
+    section_id -> results in job order.
+    """
+    results = {section_id: [None] * len(jobs) for section_id, jobs in job_lists.items()}
+    occurrences = {}
+    for section_id, jobs in job_lists.items():
+        for position, (field, index, text, lang) in enumerate(jobs):
+            replayed = journal.get(section_id, field, index, lang, text) if journal is not None else None
+            if replayed is not None:
+                results[section_id][position] = replayed
             else:
-                print(f"    ✗ Translation error for {target_lang}: {str(e)[:50]}")
-                return text  # Return original on error
-    return text
-
-
-def translate_learning_objectives(objectives_en):
-    """Translate learning objectives to all languages."""
-    result = {
-        'en': objectives_en,
-        'bn': [],
-        'hi': [],
-        'ur': [],
-        'tr': []
-    }
+                occurrences.setdefault((text, lang), []).append((section_id, position))
     
-    for i, obj in enumerate(objectives_en):
-        for lang_key, lang_code in LANGUAGES.items():
-            translated = translate_text(obj, lang_code)
-            result[lang_key].append(translated)
-            time.sleep(0.3)  # Rate limiting
-        print(f"      Translated objective {i+1}/{len(objectives_en)}")
+    unique = list(occurrences)
+    pending = sum(len(places) for places in occurrences.values())
+    if pending:
+        print(f"\n🔁 Deduplication: {pending} segments → {len(unique)} unique, "
+              f"saved {pending - len(unique)} requests")
+    
+    def fan_out(pair, translated):
+        text, lang = pair
+        failed = (text, lang) in failed_translations
+        for section_id, position in occurrences[(text, lang)]:
+            results[section_id][position] = translated
+            if journal is not None and not failed:
+                field, index, _, _ = job_lists[section_id][position]
+                journal.record(section_id, field, index, lang, text, translated)
     
-    return result
+    translate_parallel(unique, lambda position, translated: fan_out(unique[position], translated))
+    
+    for round_number in range(1, retry_rounds + 1):
+        retry = [pair for pair in unique if pair in failed_translations]
+        if not retry:
+            break
+        print(f"\n↻ Retry round {round_number}/{retry_rounds}: {len(retry)} failed segments")
+        time.sleep(RETRY_ROUND_DELAY)
+        with failed_lock:
+            failed_translations.difference_update(retry)
+        translate_parallel(retry, lambda position, translated: fan_out(retry[position], translated))
+    
+    return results
+
 
+def is_batchable(text):
+    """Return True if text is short enough to share a request with other segments."""
+    return len(text) <= BATCH_SEGMENT_MAX_CHARS and not BATCH_SPLIT_RE.search(text)
 
-def translate_grammar_focus(grammar_en):
-    """Translate grammar focus to all languages."""
-    result = {'en': grammar_en}
+
+def make_batches(segments):
+    """Group (index, text) pairs into batches under the request size limits."""
+    batches = []
+    current = []
+    size = 0
+    for index, text in segments:
+        cost = len(text) + len(BATCH_DELIMITER)
+        if current and (size + cost > BATCH_MAX_CHARS or len(current) >= BATCH_MAX_SEGMENTS):
+            batches.append(current)
+            current = []
+            size = 0
+        current.append((index, text))
+        size += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(texts, target_lang):
+    """Translate several short texts into one language with a single request.
+
+    Falls back to one request per text when the response does not split back
+    into the same number of segments.
+    """
+    if len(texts) == 1:
+        return [translate_text(texts[0], target_lang)]
     
-    for lang_key, lang_code in LANGUAGES.items():
-        print(f"      Translating to {lang_key}...")
-        result[lang_key] = translate_text(grammar_en, lang_code)
-        time.sleep(1)  # Rate limiting for longer texts
+    translated = _translate_uncached(BATCH_DELIMITER.join(texts), target_lang)
+    if translated is not None:
+        parts = BATCH_SPLIT_RE.split(translated.strip())
+        if len(parts) == len(texts) and all(parts):
+            if translation_memory is not None:
+                for text, part in zip(texts, parts):
+                    translation_memory.put(text, 'en', target_lang, part)
+            return parts
+        print(f"    ! Batch of {len(texts)} for {target_lang} came back as {len(parts)} segments, "
+              f"translating individually")
     
-    return result
+    return [translate_text(text, target_lang) for text in texts]
 
 
-def process_section(filepath):
-    """Process and translate a single section file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        section = json.load(f)
+def _translate_parallel_batched(jobs, on_result=None):
+    """Batched variant of translate_parallel."""
+    results = [None] * len(jobs)
+    singles = []
+    pending = {}
     
-    section_id = section.get('id', os.path.basename(filepath).replace('.json', ''))
-    print(f"\n📁 Processing {section_id}...")
+    for index, (text, lang) in enumerate(jobs):
+        if not text or text.strip() == '':
+            results[index] = ''
+            if on_result is not None:
+                on_result(index, '')
+        elif not is_batchable(text):
+            singles.append(index)
+        else:
+            cached = translation_memory.get(text, 'en', lang) if translation_memory is not None else None
+            if cached is not None:
+                results[index] = cached
+                if on_result is not None:
+                    on_result(index, cached)
+            else:
+                pending.setdefault(lang, []).append((index, text))
     
-    modified = False
+    work = [([index], jobs[index][1]) for index in singles]
+    for lang, segments in pending.items():
+        for batch in make_batches(segments):
+            work.append(([index for index, _ in batch], lang))
     
-    if 'textContent' not in section or not section['textContent']:
-        print("  - No textContent, skipping")
-        return False
+    def run(item):
+        indices, lang = item
+        translations = translate_batch([jobs[index][0] for index in indices], lang)
+        if on_result is not None:
+            for index, translated in zip(indices, translations):
+                on_result(index, translated)
+        return translations
     
-    # Translate Learning Objectives
-    learning_objs = section['textContent'].get('learningObjectives', {})
+    for (indices, _), translations in zip(work, _run_parallel(run, work)):
+        for index, translated in zip(indices, translations):
+            results[index] = translated
     
-    # Get English objectives
-    if isinstance(learning_objs, list):
-        english_objs = learning_objs
-    elif isinstance(learning_objs, dict):
-        english_objs = learning_objs.get('en', [])
-    else:
-        english_objs = []
-    
-    if english_objs:
-        print(f"    Translating {len(english_objs)} learning objectives...")
-        translated_objs = translate_learning_objectives(english_objs)
-        section['textContent']['learningObjectives'] = translated_objs
-        modified = True
-    
-    # Translate Grammar Focus
-    grammar_focus = section['textContent'].get('grammarFocus', {})
-    
-    # Get English grammar
-    if isinstance(grammar_focus, str):
-        english_grammar = grammar_focus
-    elif isinstance(grammar_focus, dict):
-        english_grammar = grammar_focus.get('en', grammar_focus.get('de', ''))
+    return results
+
+
+# Multilingual textContent fields translated from their 'en' value
+TEXT_CONTENT_FIELDS = ['introduction', 'culturalNotes', 'summary']
+
+# Template placeholders such as "[VOCAB_1_BN]" count as missing translations
+PLACEHOLDER_RE = re.compile(r'^\[[^\]]*\]$')
+
+
+def _is_missing(value):
+    if isinstance(value, list):
+        return not value or any(_is_missing(item) for item in value)
+    return not isinstance(value, str) or value.strip() == '' or bool(PLACEHOLDER_RE.match(value.strip()))
+
+
+def collect_translatable_fields(section):
+    """Return (field_path, container, english) for every translatable field.
+
+    container is the multilingual dict that receives the translations and
+    english is a string or, for learning objectives, a list of strings.
+    Legacy learningObjectives lists and grammarFocus strings are converted to
+    multilingual dicts in place.
+    """
+    fields = []
+    text_content = section.get('textContent') or {}
+    
+    for key in TEXT_CONTENT_FIELDS:
+        container = text_content.get(key)
+        if isinstance(container, dict):
+            fields.append((f'textContent.{key}', container, container.get('en')))
+    
+    objectives = text_content.get('learningObjectives')
+    if isinstance(objectives, list):
+        objectives = text_content['learningObjectives'] = {'en': objectives}
+    if isinstance(objectives, dict):
+        fields.append(('textContent.learningObjectives', objectives, objectives.get('en')))
+    
+    grammar = text_content.get('grammarFocus')
+    if isinstance(grammar, str):
+        grammar = text_content['grammarFocus'] = {'en': grammar}
+    if isinstance(grammar, dict):
+        fields.append(('textContent.grammarFocus', grammar, grammar.get('en', grammar.get('de'))))
+    
+    for i, vocab in enumerate(section.get('vocabulary', [])):
+        for key in ('translation', 'exampleTranslation'):
+            container = vocab.get(key)
+            if isinstance(container, dict):
+                fields.append((f'vocabulary[{i}].{key}', container, container.get('en')))
+    
+    for d, dialogue in enumerate(section.get('dialogues', [])):
+        for l, line in enumerate(dialogue.get('lines', [])):
+            container = line.get('translation')
+            if isinstance(container, dict):
+                fields.append((f'dialogues[{d}].lines[{l}].translation', container, container.get('en')))
+    
+    for i, exercise in enumerate(section.get('exercises', [])):
+        container = exercise.get('explanation')
+        if isinstance(container, dict):
+            fields.append((f'exercises[{i}].explanation', container, container.get('en')))
+    
+    return [field for field in fields if not _is_missing(field[2])]
+
+
+def field_hash(english):
+    """Hash of a field's English source (a string or a list of strings)."""
+    if isinstance(english, list):
+        return source_hash(json.dumps(english, ensure_ascii=False))
+    return source_hash(english)
+
+
+def needs_translation(section_id, field_path, container, english, force=False):
+    """Decide whether a field has to be (re)translated.
+
+    Fields whose English source hash matches the manifest are skipped. Fields
+    without a manifest entry are only translated if a target language is
+    missing, so existing translations are adopted rather than overwritten.
+    """
+    if force:
+        return True
+    recorded = manifest.get(section_id, field_path) if manifest is not None else None
+    if recorded is not None:
+        return recorded != field_hash(english)
+    return any(_is_missing(container.get(lang_key)) for lang_key in LANGUAGES)
+
+
+def estimate_plan(job_lists):
+    """Count what translate_deduplicated would send, per target language, without sending it.
+
+    Accounts for translation memory hits, corpus-wide deduplication, batching
+    and chunking of long texts.
+    """
+    report = {
+        lang_code: {'segments': 0, 'unique': 0, 'cached': 0, 'to_send': 0, 'chars': 0, 'requests': 0}
+        for lang_code in LANGUAGES.values()
+    }
+    seen = set()
+    pending = {}
+    for jobs in job_lists.values():
+        for _, _, text, lang in jobs:
+            stats = report[lang]
+            stats['segments'] += 1
+            if (text, lang) in seen:
+                continue
+            seen.add((text, lang))
+            stats['unique'] += 1
+            if translation_memory is not None and translation_memory.get(text, 'en', lang) is not None:
+                stats['cached'] += 1
+                continue
+            stats['to_send'] += 1
+            stats['chars'] += len(text)
+            pending.setdefault(lang, []).append(text)
+    
+    for lang, texts in pending.items():
+        batchable = []
+        for text in texts:
+            if batch_mode and is_batchable(text):
+                batchable.append((len(batchable), text))
+            elif len(text) > CHUNK_MAX_CHARS:
+                report[lang]['requests'] += len(chunk_markdown(text))
+            else:
+                report[lang]['requests'] += 1
+        report[lang]['requests'] += len(make_batches(batchable))
+    
+    return report
+
+
+def print_plan(report, rps, workers, latency):
+    """Print the --plan report and the projected wall-clock time."""
+    columns = ['segments', 'unique', 'cached', 'to_send', 'chars', 'requests']
+    totals = {column: sum(stats[column] for stats in report.values()) for column in columns}
+    
+    print("\n📋 Translation plan (no network calls)")
+    print(f"   {'Lang':<6}" + "".join(f"{column.replace('_', ' ').title():>12}" for column in columns))
+    for lang, stats in list(report.items()) + [('total', totals)]:
+        print(f"   {lang:<6}" + "".join(f"{stats[column]:>12,}" for column in columns))
+    
+    print(f"\n   Deduplication saves {totals['segments'] - totals['unique']:,} segments, "
+          f"translation memory {totals['cached']:,}")
+    
+    # Throughput is capped by the rate limit or by workers / latency, whichever is lower
+    throughput = min(rps, workers / latency)
+    seconds = totals['requests'] / throughput if throughput else 0
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    print(f"   Projected time at {rps} requests/s, {workers} workers, {latency}s latency: "
+          f"{hours}h {minutes:02d}m {seconds:02d}s")
+
+
+def build_jobs(fields):
+    """Expand fields into (field, index, text, target_lang) jobs, language by language."""
+    jobs = []
+    for field_path, _, english in fields:
+        items = english if isinstance(english, list) else [english]
+        for lang_code in LANGUAGES.values():
+            for i, text in enumerate(items):
+                jobs.append((field_path, i, text, lang_code))
+    return jobs
+
+
+def apply_translations(fields, translations):
+    """Fill the fields' containers from results in build_jobs order.
+
+    Languages with a failed segment keep their previous value instead of the
+    English fallback. Returns the field paths whose translations all succeeded.
+    """
+    translations = iter(translations)
+    completed = []
+    for field_path, container, english in fields:
+        items = english if isinstance(english, list) else [english]
+        succeeded = True
+        for lang_key, lang_code in LANGUAGES.items():
+            translated = [next(translations) for _ in items]
+            if any((text, lang_code) in failed_translations for text in items):
+                succeeded = False
+                continue
+            container[lang_key] = translated if isinstance(english, list) else translated[0]
+        if succeeded:
+            completed.append(field_path)
+    return completed
+
+
+def plan_section(filepath, repository, force=False):
+    """Load a section and work out which of its fields need translating.
+
+    Returns a plan dict, or None if the section has nothing to translate.
+    """
+    section = repository.section(file_section_id(os.path.basename(filepath)))
+    
+    section_id = section.get('id', os.path.basename(filepath).replace('.json', ''))
+    
+    fields = collect_translatable_fields(section)
+    if not fields:
+        print(f"  - {section_id}: no translatable content, skipping")
+        return None
+    
+    stale = [field for field in fields if needs_translation(section_id, *field, force=force)]
+    if stale:
+        segments = sum(len(english) if isinstance(english, list) else 1 for _, _, english in stale)
+        print(f"  📁 {section_id}: {len(stale)} changed fields ({segments} segments), "
+              f"{len(fields) - len(stale)} unchanged")
     else:
-        english_grammar = ''
+        print(f"  - {section_id}: all {len(fields)} fields up to date")
+    
+    return {
+        'filepath': filepath,
+        'id': section_id,
+        'section': section,
+        'fields': fields,
+        'stale': stale,
+    }
+
+
+def finish_section(plan, translations):
+    """Apply a section's translations, save it and update the manifest."""
+    section_id = plan['id']
+    hashes = {field_path: field_hash(english) for field_path, _, english in plan['fields']}
     
-    if english_grammar:
-        print(f"    Translating grammar focus ({len(english_grammar)} chars)...")
-        translated_grammar = translate_grammar_focus(english_grammar)
-        section['textContent']['grammarFocus'] = translated_grammar
-        modified = True
+    if plan['stale']:
+        completed = set(apply_translations(plan['stale'], translations))
+        for field_path, _, _ in plan['stale']:
+            if field_path not in completed:
+                # Keep the old hash so the field is retried on the next run
+                previous = manifest.get(section_id, field_path) if manifest is not None else None
+                if previous is None:
+                    del hashes[field_path]
+                else:
+                    hashes[field_path] = previous
+        
+        if write_if_changed(plan['filepath'], plan['section']):
+            print(f"  ✓ Saved translations for {section_id}")
     
-    if modified:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(section, f, ensure_ascii=False, indent=4)
-        print(f"  ✓ Saved translations for {section_id}")
+    if manifest is not None:
+        manifest.update_section(section_id, hashes)
     
-    return modified
+    return bool(plan['stale'])
 
 
 def main():
+    global translation_memory, journal, manifest, backend, executor, chunk_executor, rate_limiter, concurrency
+    global batch_mode, retry_rounds
+
+    parser = argparse.ArgumentParser(description="Translate section content into all supported languages")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Translation service to use")
+    parser.add_argument("--backend-url", default=DEFAULT_BACKEND_URL,
+                        help="Base URL for --backend http (e.g. a local mock_translate_server.py)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local translation memory")
+    parser.add_argument("--cache-path", default=TRANSLATION_MEMORY_PATH, help="SQLite translation memory file")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-translate every field, ignoring the source hash manifest")
+    parser.add_argument("--manifest-path", default=MANIFEST_PATH, help="Source hash manifest file")
+    parser.add_argument("--resume", action="store_true",
+                        help="Replay the checkpoint journal and continue an interrupted run")
+    parser.add_argument("--journal-path", default=TRANSLATION_JOURNAL_PATH, help="Checkpoint journal file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Maximum concurrent translation requests")
+    parser.add_argument("--initial-concurrency", type=int, default=DEFAULT_INITIAL_CONCURRENCY,
+                        help="Concurrent requests to start with before adapting")
+    parser.add_argument("--retry-rounds", type=int, default=DEFAULT_RETRY_ROUNDS,
+                        help="Extra passes over segments that failed")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="Requests per second shared by all workers")
+    parser.add_argument("--no-batch", action="store_true", help="Send one request per segment")
+    parser.add_argument("--plan", action="store_true",
+                        help="Dry run: estimate segments, requests and time without translating")
+    parser.add_argument("--latency", type=float, default=DEFAULT_PLAN_LATENCY,
+                        help="Assumed seconds per request for --plan projections")
+    args = parser.parse_args()
+    
     print("🌐 MedDeutsch Content Translator")
-    print("Using Google Translate (deep-translator)")
+    if args.plan:
+        print("Dry run: no translation requests will be sent")
+    elif args.backend == HttpBackend.name:
+        print(f"Using HTTP translation backend at {args.backend_url}")
+    else:
+        print("Using Google Translate (deep-translator)")
     print("=" * 50)
     
-    section_files = sorted(glob.glob(os.path.join(SECTIONS_DIR, 'section_*.json')))
-    print(f"\nFound {len(section_files)} sections to translate.\n")
+    if not args.no_cache:
+        translation_memory = TranslationMemory(args.cache_path)
+        print(f"Translation memory: {args.cache_path}")
     
-    translated_count = 0
+    manifest = TranslationManifest(args.manifest_path)
+    batch_mode = not args.no_batch
     
+    repository = ContentRepository(sections_dir=SECTIONS_DIR)
+    section_files = list(repository.section_paths().values())
+    print(f"\nFound {len(section_files)} sections to translate.\n")
+    
+    # Plan every section first so identical strings are translated only once
+    plans = []
     for filepath in section_files:
         try:
-            if process_section(filepath):
+            plan = plan_section(filepath, repository, force=args.force)
+        except Exception as e:
+            print(f"  ✗ Error in {os.path.basename(filepath)}: {str(e)[:80]}")
+            continue
+        if plan is not None:
+            plans.append(plan)
+    
+    job_lists = {plan['id']: build_jobs(plan['stale']) for plan in plans if plan['stale']}
+    
+    if args.plan:
+        print_plan(estimate_plan(job_lists), args.rps, args.workers, args.latency)
+        if translation_memory is not None:
+            translation_memory.close()
+        return
+    
+    backend = create_backend(args.backend, args.backend_url, pool_size=args.workers)
+    journal = TranslationJournal(args.journal_path, resume=args.resume)
+    if args.resume:
+        print(f"\nResuming from journal: {len(journal.entries)} finished segments")
+    
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    chunk_executor = ThreadPoolExecutor(max_workers=args.workers)
+    rate_limiter = TokenBucket(args.rps)
+    concurrency = AdaptiveConcurrency(args.initial_concurrency, maximum=args.workers)
+    retry_rounds = args.retry_rounds
+    print(f"Workers: {args.initial_concurrency}→{args.workers} (adaptive), rate limit: {args.rps} requests/s, "
+          f"batching: {'on' if batch_mode else 'off'}")
+    
+    results = translate_deduplicated(job_lists)
+    
+    print()
+    translated_count = 0
+    for plan in plans:
+        try:
+            if finish_section(plan, results.get(plan['id'], [])):
                 translated_count += 1
         except Exception as e:
-            print(f"  ✗ Error: {str(e)[:80]}")
+            print(f"  ✗ Error in {plan['id']}: {str(e)[:80]}")
+    # Once per run rather than per section; sections that failed above keep their old hashes
+    if manifest is not None:
+        manifest.save()
+    
+    executor.shutdown()
+    chunk_executor.shutdown()
+    backend.close()
+    journal.close()
     
     print("\n" + "=" * 50)
     print(f"\n✅ Translation complete!")
     print(f"   Translated: {translated_count} sections")
+    if translation_memory is not None:
+        print(f"   Translation memory: {translation_memory.hits} hits, {translation_memory.misses} misses")
+        translation_memory.close()
+    if journal.replayed:
+        print(f"   Replayed from journal: {journal.replayed} segments")
+    print(f"   Requests: {concurrency.successes} ok, {concurrency.throttles} throttled, {concurrency.errors} failed; "
+          f"peak concurrency {concurrency.peak:.1f}")
+    if failed_translations:
+        print(f"   ⚠ {len(failed_translations)} segments still failing; rerun to retry them")
     print("""
 Next steps:
 1. Upload content to Firestore: node upload_to_firebase.js
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Validate the content tree before it is uploaded.
+Checks that every section, phases.json and every mock test parses, has the
+keys the app expects, uses unique ids and contains no leftover template
+placeholders ([VOCAB_1_GERMAN], [SUMMARY_EN], ...). Exits with status 1 if
+any error is found.
+
+Usage:
+    python validate_content.py
+    python validate_content.py --content-dir ../content
+    python validate_content.py --check-template     # A fresh template must fail
+"""
+
+import argparse
+import json
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from content_repository import ContentRepository, section_code, write_if_changed
+
+CONTENT_ROOT = Path(__file__).parent.parent / "content"
+
+LANGUAGES = ['en', 'bn', 'hi', 'ur', 'tr']
+REQUIRED_SECTION_KEYS = ["id", "phaseId", "order", "title", "level", "textContent", "vocabulary", "dialogues", "exercises"]
+REQUIRED_MOCK_TEST_KEYS = ["id", "phaseId", "type", "title", "questionCount", "questions"]
+# Whole values like [VOCAB_1_GERMAN] or [DIALOGUE_1_LINE_1_DE], as generate_content.py writes them.
+# Lowercase is left out so IPA pronunciations such as [ˈlʊŋə] never match.
+PLACEHOLDER_RE = re.compile(r'^\[[A-Z0-9_]+\]$')
+
+
+def load_json(path: Path, errors: list, load):
+    """Call load() for the repository's copy of path, recording a parse error instead of raising."""
+    try:
+        return load()
+    except (OSError, json.JSONDecodeError) as e:
+        errors.append(f"{path.name}: cannot be read ({e})")
+        return None
+
+
+def find_placeholder(value) -> Optional[str]:
+    """First template placeholder anywhere in value, or None."""
+    if isinstance(value, str):
+        return value.strip() if PLACEHOLDER_RE.match(value.strip()) else None
+    values = value.values() if isinstance(value, dict) else value if isinstance(value, list) else []
+    for v in values:
+        placeholder = find_placeholder(v)
+        if placeholder:
+            return placeholder
+    return None
+
+
+def has_placeholder(value) -> bool:
+    return find_placeholder(value) is not None
+
+
+def validate_sections(repository: ContentRepository, phase_ids: set, errors: list, warnings: list) -> dict:
+    """Check every section file; return phaseId -> number of sections."""
+    section_ids = {}
+    item_ids = {}
+    per_phase = {}
+
+    for file_id, path in repository.section_paths().items():
+        section = load_json(path, errors, lambda: repository.section(file_id))
+        if not isinstance(section, dict):
+            continue
+
+        missing = [key for key in REQUIRED_SECTION_KEYS if key not in section]
+        if missing:
+            errors.append(f"{path.name}: missing {', '.join(missing)}")
+
+        section_id = section.get("id")
+        if section_id in section_ids:
+            errors.append(f"{path.name}: id {section_id} also used by {section_ids[section_id]}")
+        section_ids[section_id] = path.name
+
+        phase_id = section.get("phaseId")
+        # Supplementary sections such as section_01a are not part of a phase's sectionCount
+        if (section_code(path.name) or "").isdigit():
+            per_phase[phase_id] = per_phase.get(phase_id, 0) + 1
+        if phase_ids and phase_id not in phase_ids:
+            errors.append(f"{path.name}: unknown phaseId {phase_id}")
+
+        title = section.get("title")
+        if isinstance(title, dict):
+            missing_langs = [lang for lang in LANGUAGES if not title.get(lang)]
+            if missing_langs:
+                warnings.append(f"{path.name}: title lacks {', '.join(missing_langs)}")
+
+        for component in ("vocabulary", "dialogues", "exercises"):
+            items = section.get(component, [])
+            if not isinstance(items, list):
+                errors.append(f"{path.name}: {component} is not a list")
+                continue
+            if not items:
+                warnings.append(f"{path.name}: no {component}")
+            for position, item in enumerate(items):
+                item_id = item.get("id") if isinstance(item, dict) else None
+                if not item_id:
+                    errors.append(f"{path.name}: {component}[{position}] has no id")
+                elif item_id in item_ids:
+                    errors.append(f"{path.name}: {component} id {item_id} also used in {item_ids[item_id]}")
+                else:
+                    item_ids[item_id] = path.name
+
+        placeholder = find_placeholder(section)
+        if placeholder:
+            errors.append(f"{path.name}: contains template placeholders such as {placeholder}")
+
+    return per_phase
+
+
+def validate_phases(repository: ContentRepository, errors: list) -> dict:
+    """Check phases.json; return phase id -> declared sectionCount."""
+    phases_path = repository.phases_path
+    phases = load_json(phases_path, errors, repository.phases)
+    if phases is None:
+        return {}
+    if not phases:
+        errors.append(f"{phases_path.name}: no phases")
+    counts = {}
+    for phase in phases:
+        if not isinstance(phase, dict) or "id" not in phase:
+            errors.append(f"{phases_path.name}: phase without id")
+            continue
+        if phase["id"] in counts:
+            errors.append(f"{phases_path.name}: duplicate phase {phase['id']}")
+        counts[phase["id"]] = phase.get("sectionCount")
+    return counts
+
+
+def validate_mock_tests(repository: ContentRepository, phase_ids: set, errors: list):
+    """Check every mock test file."""
+    for path in repository.mock_test_paths():
+        test = load_json(path, errors, lambda: repository.mock_test_file(path))
+        if not isinstance(test, dict):
+            continue
+        missing = [key for key in REQUIRED_MOCK_TEST_KEYS if key not in test]
+        if missing:
+            errors.append(f"{path.name}: missing {', '.join(missing)}")
+        if phase_ids and test.get("phaseId") not in phase_ids:
+            errors.append(f"{path.name}: unknown phaseId {test.get('phaseId')}")
+        questions = test.get("questions", [])
+        if isinstance(test.get("questionCount"), int) and test["questionCount"] != len(questions):
+            errors.append(f"{path.name}: questionCount {test['questionCount']} but {len(questions)} questions")
+        seen = set()
+        for question in questions:
+            question_id = question.get("id") if isinstance(question, dict) else None
+            if question_id in seen:
+                errors.append(f"{path.name}: duplicate question id {question_id}")
+            seen.add(question_id)
+
+
+def validate(content_root: Path = CONTENT_ROOT) -> tuple:
+    """Validate the whole content tree; return (errors, warnings)."""
+    errors = []
+    warnings = []
+    repository = ContentRepository(content_root)
+    phase_counts = validate_phases(repository, errors)
+    phase_ids = set(phase_counts)
+    per_phase = validate_sections(repository, phase_ids, errors, warnings)
+    for phase_id, declared in phase_counts.items():
+        if declared is not None and declared != per_phase.get(phase_id, 0):
+            warnings.append(f"phases.json: {phase_id} declares {declared} sections, found {per_phase.get(phase_id, 0)}")
+    validate_mock_tests(repository, phase_ids, errors)
+    return errors, warnings
+
+
+def check_template(content_root: Path = CONTENT_ROOT, section_id: str = "section_19") -> bool:
+    """Validate a fresh generate_content.py template in a scratch content tree; True if it is rejected."""
+    from generate_content import SECTIONS, generate_section_template
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "sections").mkdir()
+        shutil.copy(content_root / "phases.json", root / "phases.json")
+        template = generate_section_template(section_id, SECTIONS[section_id])
+        write_if_changed(root / "sections" / f"{section_id}.json", template)
+        errors, _ = validate(root)
+
+    rejected = any("template placeholders" in error for error in errors)
+    print(f"{'✓' if rejected else '✗'} Template {section_id} {'fails' if rejected else 'passes'} validation")
+    return rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate sections, phases and mock tests")
+    parser.add_argument("--content-dir", type=Path, default=CONTENT_ROOT, help="Content root to check")
+    parser.add_argument("--quiet", action="store_true", help="Only print errors")
+    parser.add_argument("--check-template", action="store_true",
+                        help="Check that a freshly generated section template fails validation")
+    args = parser.parse_args()
+
+    if args.check_template:
+        sys.exit(0 if check_template(args.content_dir) else 1)
+
+    errors, warnings = validate(args.content_dir)
+    if not args.quiet:
+        for warning in warnings:
+            print(f"⚠ {warning}")
+    for error in errors:
+        print(f"✗ {error}")
+
+    if errors:
+        print(f"\n✗ {len(errors)} errors, {len(warnings)} warnings")
+        sys.exit(1)
+    print(f"✓ Content valid ({len(warnings)} warnings)")
+
+
+if __name__ == "__main__":
+    main()